@@ -2,3 +2,6 @@ CREATE SCHEMA IF NOT EXISTS auth_db;
 CREATE SCHEMA IF NOT EXISTS catalog_db;
 CREATE SCHEMA IF NOT EXISTS order_db;
 CREATE SCHEMA IF NOT EXISTS profile_db;
+
+-- Extensões e configuração de busca textual do Catalog Service: python manage.py setup_search
+-- (roda antes do migrate no docker-compose, então vale também para bancos já inicializados)
@@ -101,6 +101,25 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Redis: geração de revogação por usuário (users/token_cache.py), compartilhada por todos os workers
+CACHES = {
+    "default": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": env('REDIS_URL', default='redis://redis:6379/0'),
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+        }
+    }
+}
+
+# Cache em memória do endpoint de validação do Traefik (ForwardAuth).
+# Cada worker tem o seu; uma entrada só vale enquanto a geração do usuário no Redis não mudar.
+TOKEN_VALIDATION_CACHE_SIZE = env.int('TOKEN_VALIDATION_CACHE_SIZE', default=10000)
+TOKEN_VALIDATION_CACHE_TTL = env.int('TOKEN_VALIDATION_CACHE_TTL', default=30)
+# Devolvido ao ForwardAuth (X-Gateway-Secret) junto com os X-User-*: os serviços só confiam nesses
+# headers quando o segredo confere (AUTH_GATEWAY_SECRET igual em todos os serviços)
+AUTH_GATEWAY_SECRET = env('AUTH_GATEWAY_SECRET', default='')
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Lykos Auth Service API',
     'DESCRIPTION': 'Autenticação e gerenciamento de usuários',
@@ -177,4 +196,15 @@ CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 
 # Configuração para garantir que a mensagem chegue (confiabilidade)
-CELERY_TASK_ACKS_LATE = True
\ No newline at end of file
+CELERY_TASK_ACKS_LATE = True
+# Publisher confirms: a publicação só retorna depois do ack do RabbitMQ (o relay do outbox depende disso)
+CELERY_BROKER_TRANSPORT_OPTIONS = {'confirm_publish': True}
+
+# === OUTBOX (eventos para os outros serviços, publicados por manage.py relay_outbox) ===
+OUTBOX_BATCH_SIZE = env.int('OUTBOX_BATCH_SIZE', default=100)
+OUTBOX_POLL_INTERVAL = env.float('OUTBOX_POLL_INTERVAL', default=0.5)
+OUTBOX_RETENTION_DAYS = env.int('OUTBOX_RETENTION_DAYS', default=7)
+# Falhas (sem contar broker fora do ar) até o evento ser estacionado (failed_at) e o relay seguir adiante
+OUTBOX_MAX_ATTEMPTS = env.int('OUTBOX_MAX_ATTEMPTS', default=10)
+# Fila do consumidor em lote do Profile Service (tem que ser a mesma USER_CREATED_QUEUE de lá)
+USER_CREATED_QUEUE = env('USER_CREATED_QUEUE', default='profile_user_created')
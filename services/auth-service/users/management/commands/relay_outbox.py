@@ -0,0 +1,49 @@
+import logging
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from users.outbox import purge_published, relay_batch
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Publica no RabbitMQ os eventos pendentes do outbox (ex: user_created), em lotes com confirmação'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.OUTBOX_BATCH_SIZE)
+        parser.add_argument('--interval', type=float, default=settings.OUTBOX_POLL_INTERVAL,
+                            help='Segundos de espera quando não há eventos pendentes')
+        parser.add_argument('--once', action='store_true', help='Esvazia o outbox uma vez e sai')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        interval = options['interval']
+        backoff = interval
+        last_purge = 0
+
+        while True:
+            try:
+                published = relay_batch(batch_size, settings.OUTBOX_MAX_ATTEMPTS)
+                backoff = interval
+            except Exception as e:
+                # Broker fora do ar: os eventos continuam no outbox; recua até 30s entre tentativas
+                logger.error(f"Relay do outbox sem broker: {str(e)}")
+                if options['once']:
+                    raise
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+                continue
+
+            if published:
+                self.stdout.write(f"{published} eventos publicados.")
+
+            if time.monotonic() - last_purge > 3600:
+                purge_published(settings.OUTBOX_RETENTION_DAYS)
+                last_purge = time.monotonic()
+
+            # Lote cheio: provavelmente tem mais, segue sem esperar
+            if published < batch_size:
+                if options['once']:
+                    return
+                time.sleep(interval)
@@ -103,4 +103,33 @@ class Endereco(models.Model):
     estado = models.CharField(max_length=50)
 
     def __str__(self):
-        return f"{self.logradouro}, {self.numero}"
\ No newline at end of file
+        return f"{self.logradouro}, {self.numero}"
+
+class OutboxEvent(models.Model):
+    """
+    Outbox transacional: o evento é gravado na mesma transação da mudança que o originou
+    e publicado no RabbitMQ depois, pelo relay (manage.py relay_outbox).
+    """
+    id = models.BigAutoField(primary_key=True)
+    event = models.CharField(max_length=100)  # Nome da task Celery consumida pelos outros serviços
+    payload = models.JSONField()
+    queue = models.CharField(max_length=100, blank=True)  # Vazio = fila padrão
+    created_at = models.DateTimeField(auto_now_add=True)
+    published_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    # Estacionado depois de OUTBOX_MAX_ATTEMPTS falhas: sai da fila do relay (reprocessar = limpar o campo)
+    failed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Fila de pendentes do relay: índice pequeno, só com o que falta publicar
+            models.Index(
+                fields=['id'],
+                condition=models.Q(published_at__isnull=True, failed_at__isnull=True),
+                name='outbox_pending_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.event} #{self.id}"
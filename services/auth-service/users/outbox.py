@@ -0,0 +1,90 @@
+import logging
+from datetime import timedelta
+from celery import current_app
+from django.db import transaction
+from django.utils import timezone
+from kombu.exceptions import OperationalError as BrokerError
+from .models import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue(event, payload, queue=''):
+    """
+    Registra um evento para publicação. Chame dentro do transaction.atomic() da mudança:
+    o evento só existe se a transação fizer COMMIT, e a requisição não espera pelo broker.
+    """
+    return OutboxEvent.objects.create(event=event, payload=payload, queue=queue)
+
+
+def relay_batch(batch_size=100, max_attempts=10):
+    """
+    Publica um lote de eventos pendentes, em ordem, por um único producer (uma conexão/canal).
+    Com publisher confirms (CELERY_BROKER_TRANSPORT_OPTIONS), cada publicação só retorna depois
+    do ack do RabbitMQ; só então o evento é marcado como publicado.
+
+    SKIP LOCKED permite mais de um relay em paralelo sem publicar o mesmo lote duas vezes.
+    A entrega é "pelo menos uma vez": o consumidor precisa ser idempotente.
+
+    Broker fora do ar não conta tentativa (não é culpa do evento). Um evento que falha por outro motivo
+    conta tentativas e, em max_attempts, é estacionado (failed_at): o relay segue com os próximos
+    em vez de ficar preso nele para sempre.
+    Retorna quantos eventos foram publicados.
+    """
+    with transaction.atomic():
+        events = list(
+            OutboxEvent.objects.select_for_update(skip_locked=True)
+            .filter(published_at__isnull=True, failed_at__isnull=True).order_by('id')[:batch_size]
+        )
+        if not events:
+            return 0
+
+        published = []
+        parked = 0
+        error = None
+        try:
+            with current_app.producer_or_acquire() as producer:
+                for event in events:
+                    try:
+                        current_app.send_task(
+                            event.event,
+                            args=[event.payload],
+                            queue=event.queue or None,
+                            task_id=f'outbox-{event.id}',  # Rastreável (e deduplicável) no consumidor
+                            producer=producer,
+                        )
+                    except BrokerError:
+                        raise
+                    except Exception as e:
+                        attempts = event.attempts + 1
+                        if attempts >= max_attempts:
+                            logger.error(f"{event} estacionado após {attempts} tentativas: {str(e)}")
+                            OutboxEvent.objects.filter(id=event.id).update(
+                                attempts=attempts, last_error=str(e), failed_at=timezone.now()
+                            )
+                            parked += 1
+                            continue
+                        # Para no primeiro erro, para não publicar fora de ordem; o resto fica para o próximo lote
+                        logger.error(f"Erro ao publicar {event}: {str(e)}")
+                        OutboxEvent.objects.filter(id=event.id).update(attempts=attempts, last_error=str(e))
+                        error = e
+                        break
+                    published.append(event.id)
+        except BrokerError as e:
+            error = e
+            logger.error(f"Broker indisponível para o outbox: {str(e)}")
+
+        if published:
+            OutboxEvent.objects.filter(id__in=published).update(published_at=timezone.now())
+
+    if error is not None and not published and not parked:
+        # Nada saiu: o relay recua antes de tentar de novo
+        raise error
+    return len(published)
+
+
+def purge_published(retention_days):
+    """Apaga eventos já publicados há mais de `retention_days` dias."""
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    deleted, _ = OutboxEvent.objects.filter(published_at__lt=cutoff).delete()
+    return deleted
@@ -1,13 +1,14 @@
 from datetime import date
+from django.conf import settings
 from django.db import transaction
 from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from celery import current_app
 
 # Importações da SUA lib compartilhada
 from shared.utils import validate_cpf, formatar_telefone
 from .models import Usuario, Pessoa, Endereco
+from . import outbox
 
 
 class UsuarioSerializer(serializers.ModelSerializer):
@@ -77,7 +78,7 @@ class RegisterSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         pessoa_data = validated_data.pop('pessoa')
-        enderecos_data = validated_data.pop('enderecos')
+        enderecos_data = validated_data.pop('enderecos', [])
         validated_data.pop('senha2')
         senha = validated_data.pop('senha_hash')
 
@@ -89,17 +90,13 @@ class RegisterSerializer(serializers.ModelSerializer):
             for endereco in enderecos_data:
                 Endereco.objects.create(usuario=user, **endereco)
 
-        try:
-            payload = {
+            # Mesmo COMMIT do usuário: o relay publica depois, sem o broker no caminho do cadastro
+            outbox.enqueue('user_created', {
                 'id': user.id,
                 'email': user.email,
                 'nome_usuario': user.nome_usuario,
                 'tipo': user.tipo
-            }
-
-            current_app.send_task('user_created', args=[payload])
-        except Exception as e:
-            print(f"Erro ao criar usuario: {e}")
+            }, queue=settings.USER_CREATED_QUEUE)
 
         return user
 
@@ -122,6 +119,8 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         token['email'] = user.email
         token['tipo'] = user.tipo
         token['user_id'] = user.id
+        # Os outros serviços montam o usuário só pelo token (shared.auth), sem consultar o Auth
+        token['is_staff'] = user.is_staff
 
         return token
 
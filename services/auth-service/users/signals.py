@@ -1,8 +1,11 @@
 # users/signals.py
-from django.db.models.signals import post_save
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from allauth.socialaccount.models import SocialAccount
 from .models import Usuario, Pessoa
+from . import token_cache
 
 @receiver(post_save, sender=SocialAccount)
 def create_pessoa_from_google(sender, instance, created, **kwargs):
@@ -23,4 +26,22 @@ def create_pessoa_from_google(sender, instance, created, **kwargs):
                 'data_nascimento': None,
                 'telefone': ''
             }
-        )
\ No newline at end of file
+        )
+
+
+@receiver([post_save, post_delete], sender=Usuario)
+def invalidate_token_cache(sender, instance, **kwargs):
+    # Status/is_active podem ter mudado: força a próxima validação (em qualquer worker) a reler o usuário.
+    # Depois do COMMIT: antes dele uma validação concorrente ainda leria o usuário antigo com a geração nova
+    user_id = instance.pk
+    transaction.on_commit(lambda: token_cache.invalidate_user(user_id))
+
+
+if apps.is_installed('rest_framework_simplejwt.token_blacklist'):
+    from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+    @receiver(post_save, sender=BlacklistedToken)
+    def invalidate_token_cache_on_blacklist(sender, instance, created, **kwargs):
+        if created and instance.token.user_id:
+            user_id = instance.token.user_id
+            transaction.on_commit(lambda: token_cache.invalidate_user(user_id))
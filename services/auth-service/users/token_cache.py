@@ -0,0 +1,74 @@
+import logging
+import time
+from django.conf import settings
+from django.core.cache import cache
+from shared.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Cache local (por worker) das validações feitas pelo ForwardAuth do Traefik.
+# A chave é a assinatura do JWT: única por token e já verificada na primeira passagem.
+_cache = TTLCache(
+    maxsize=settings.TOKEN_VALIDATION_CACHE_SIZE,
+    ttl=settings.TOKEN_VALIDATION_CACHE_TTL,
+)
+
+# Geração de revogação por usuário, no Redis (vale para todos os workers). Cada entrada local guarda
+# a geração lida antes de carregar o usuário; se a geração mudou, a entrada não vale mais.
+# A chave vive mais que qualquer entrada local: ao expirar, nenhuma entrada antiga volta a valer.
+GENERATION_KEY = 'auth:token_gen:{}'
+GENERATION_TTL = settings.TOKEN_VALIDATION_CACHE_TTL * 2
+
+
+def _key(raw_token):
+    if isinstance(raw_token, bytes):
+        raw_token = raw_token.decode('utf-8')
+    return raw_token.rsplit('.', 1)[-1]
+
+
+def generation(user_id):
+    """Geração atual do usuário, ou None se o Redis não respondeu (nesse caso nada é servido do cache)."""
+    try:
+        return cache.get(GENERATION_KEY.format(user_id), 0)
+    except Exception as e:
+        logger.warning(f"Geração de tokens do usuário {user_id} indisponível: {str(e)}")
+        return None
+
+
+def get_identity(raw_token):
+    """Retorna a identidade já validada deste token, ou None se não estiver no cache ou foi revogada."""
+    entry = _cache.get(_key(raw_token))
+    if entry is None:
+        return None
+    identity, entry_generation = entry
+    if generation(identity['id']) != entry_generation:
+        return None
+    return identity
+
+
+def remember(raw_token, identity, expires_at, user_generation):
+    """
+    Guarda a identidade do token com a geração lida ANTES de carregar o usuário.
+    O TTL nunca passa do 'exp' do próprio token, então um token expirado nunca é servido pelo cache.
+    """
+    if user_generation is None:
+        return
+    _cache.set(_key(raw_token), (identity, user_generation), ttl=expires_at - time.time())
+
+
+def invalidate_user(user_id):
+    """
+    Revoga as entradas de um usuário em todos os workers (ex: mudou status, foi desativado ou deslogou):
+    incrementa a geração no Redis e descarta na hora as entradas do processo local.
+    """
+    key = GENERATION_KEY.format(user_id)
+    try:
+        cache.add(key, 0, timeout=GENERATION_TTL)
+        cache.incr(key)
+    except Exception as e:
+        logger.error(f"Não foi possível revogar os tokens em cache do usuário {user_id}: {str(e)}")
+    return _cache.delete_where(lambda entry: entry[0]['id'] == user_id)
+
+
+def clear():
+    _cache.clear()
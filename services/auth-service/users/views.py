@@ -1,16 +1,24 @@
+from django.conf import settings
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
 from rest_framework import viewsets, status
 from rest_framework.views import APIView
-from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.views import TokenObtainPairView
 from drf_spectacular.utils import extend_schema
+from shared.auth import StatelessJWTAuthentication
+from shared.enums import StatusConta
 
 from .serializers import (
     UsuarioSerializer, RegisterSerializer, PessoaSerializer,
     EnderecoSerializer, CustomTokenObtainPairSerializer
 )
 from .models import Usuario, Pessoa, Endereco
+from . import token_cache
 
 
 class RegisterView(APIView):
@@ -30,6 +38,8 @@ class LoginView(TokenObtainPairView):
 
 
 class MeView(APIView):
+    # Identidade vem do token (sem carregar o Usuario só para autenticar); a view busca o que exibe
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
@@ -54,36 +64,72 @@ class MeView(APIView):
 # ViewSets mantidos para operações CRUD completas se necessário
 class PessoaViewSet(viewsets.ModelViewSet):
     serializer_class = PessoaSerializer
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Pessoa.objects.filter(usuario=self.request.user)
+        return Pessoa.objects.filter(usuario_id=self.request.user.id)
 
 
 class EnderecoViewSet(viewsets.ModelViewSet):
     serializer_class = EnderecoSerializer
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Endereco.objects.filter(usuario=self.request.user)
+        return Endereco.objects.filter(usuario_id=self.request.user.id)
 
     def perform_create(self, serializer):
-        serializer.save(usuario=self.request.user)
+        serializer.save(usuario_id=self.request.user.id)
 
 
 # --- Endpoint para o Traefik (ForwardAuth) ---
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])
+_jwt_auth = JWTAuthentication()
+
+
+@require_GET
 def validate_token(request):
     """
     Endpoint leve apenas para o Traefik verificar se o Token é válido.
-    Se o middleware 'IsAuthenticated' deixar chegar aqui, é porque é válido.
+    Roda fora da pilha do DRF: tokens já validados saem do cache em memória
+    sem tocar no banco; só o primeiro acesso de cada token carrega o Usuario.
+
+    Sem token a requisição segue anônima (200 sem X-User-*): rotas públicas (vitrine, webhooks)
+    continuam abertas e cada serviço decide pelas suas permissões. O ForwardAuth apaga os
+    X-User-*/X-Gateway-Secret enviados pelo cliente, então um anônimo não consegue forjá-los.
     """
-    # Headers que o Traefik vai injetar na requisição original
-    response = Response({"valid": True})
-    response["X-User-Id"] = str(request.user.id)
-    response["X-User-Email"] = request.user.email
-    # Se você tiver um campo 'tipo' (freelancer/cliente), é bom passar também:
-    # response["X-User-Type"] = request.user.tipo
+    header = _jwt_auth.get_header(request)
+    try:
+        # Header malformado (ex: "Bearer" sem token) também é AuthenticationFailed: 401, não 500
+        raw_token = _jwt_auth.get_raw_token(header) if header else None
+    except AuthenticationFailed:
+        return JsonResponse({"detail": "Token inválido ou expirado."}, status=401)
+    if raw_token is None:
+        return JsonResponse({"valid": False})
+
+    identity = token_cache.get_identity(raw_token)
+    if identity is None:
+        try:
+            validated_token = _jwt_auth.get_validated_token(raw_token)
+            # Geração lida antes do usuário: uma revogação durante a leitura invalida esta entrada
+            user_generation = token_cache.generation(validated_token.get(api_settings.USER_ID_CLAIM))
+            user = _jwt_auth.get_user(validated_token)
+        except AuthenticationFailed:
+            return JsonResponse({"detail": "Token inválido ou expirado."}, status=401)
+
+        if user.status != StatusConta.ATIVO:
+            return JsonResponse({"detail": "Conta inativa."}, status=401)
 
-    return response
\ No newline at end of file
+        identity = {'id': user.id, 'email': user.email, 'tipo': user.tipo, 'is_staff': user.is_staff}
+        token_cache.remember(raw_token, identity, validated_token['exp'], user_generation)
+
+    # Headers que o Traefik vai injetar na requisição original
+    response = JsonResponse({"valid": True})
+    response["X-User-Id"] = str(identity['id'])
+    response["X-User-Email"] = identity['email']
+    response["X-User-Type"] = identity['tipo']
+    response["X-User-Staff"] = '1' if identity['is_staff'] else '0'
+    if settings.AUTH_GATEWAY_SECRET:
+        response["X-Gateway-Secret"] = settings.AUTH_GATEWAY_SECRET
+
+    return response
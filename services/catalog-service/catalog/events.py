@@ -0,0 +1,29 @@
+from celery import current_app
+from django.conf import settings
+from django.db import transaction
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def gig_fingerprint(servico):
+    """O que os outros serviços guardam do Gig: preço, status e preço de cada pacote."""
+    pacotes = sorted(servico.pacotes.values_list('tipo', 'preco'))
+    return servico.preco_inicial, servico.status, tuple(pacotes)
+
+
+def publish_gig_changed(servico_id, slug):
+    """
+    Avisa os serviços consumidores (ex: Order Service) que o Gig mudou, para invalidarem seus caches.
+    Publica só depois do COMMIT; falha no broker não derruba a requisição (o TTL do cache cobre).
+    """
+    payload = {'id': servico_id, 'slug': slug}
+
+    def _send():
+        for queue in settings.GIG_EVENT_QUEUES:
+            try:
+                current_app.send_task('catalog.gig_changed', args=[payload], queue=queue)
+            except Exception as e:
+                logger.error(f"Erro ao publicar catalog.gig_changed para {queue}: {str(e)}")
+
+    transaction.on_commit(_send)
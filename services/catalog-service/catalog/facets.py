@@ -0,0 +1,68 @@
+from decimal import Decimal
+from django.db.models import Count, Q
+
+# Faixas de preço (preco_inicial) exibidas na vitrine: [min, max), max=None significa "sem limite"
+PRICE_BANDS = (
+    (Decimal('0'), Decimal('50')),
+    (Decimal('50'), Decimal('100')),
+    (Decimal('100'), Decimal('250')),
+    (Decimal('250'), Decimal('500')),
+    (Decimal('500'), None),
+)
+
+
+def _band_filter(low, high):
+    condition = Q(preco_inicial__gte=low)
+    if high is not None:
+        condition &= Q(preco_inicial__lt=high)
+    return condition
+
+
+def compute_facets(queryset):
+    """
+    Contagens por área, categoria, subcategoria e faixa de preço do queryset (já filtrado)
+    da tabela de leitura, em uma única query:
+
+        SELECT subcategoria..., COUNT(*), COUNT(*) FILTER (WHERE preco ...) ... GROUP BY subcategoria
+
+    Cada Serviço tem exatamente uma subcategoria, então área e categoria saem somando as linhas.
+    """
+    bands = {
+        f'faixa_{i}': Count('pk', filter=_band_filter(low, high))
+        for i, (low, high) in enumerate(PRICE_BANDS)
+    }
+    rows = queryset.order_by().values(
+        'area_id', 'area_nome', 'categoria_id', 'categoria_nome', 'subcategoria_id', 'subcategoria_nome'
+    ).annotate(total=Count('pk'), **bands)
+
+    areas, categorias, subcategorias = {}, {}, []
+    band_counts = [0] * len(PRICE_BANDS)
+    for row in rows:
+        area = areas.setdefault(row['area_id'], {'id': row['area_id'], 'nome': row['area_nome'], 'count': 0})
+        area['count'] += row['total']
+
+        categoria = categorias.setdefault(row['categoria_id'], {
+            'id': row['categoria_id'], 'nome': row['categoria_nome'], 'area_id': row['area_id'], 'count': 0,
+        })
+        categoria['count'] += row['total']
+
+        subcategorias.append({
+            'id': row['subcategoria_id'], 'nome': row['subcategoria_nome'],
+            'categoria_id': row['categoria_id'], 'count': row['total'],
+        })
+        for i in range(len(PRICE_BANDS)):
+            band_counts[i] += row[f'faixa_{i}']
+
+    def by_count(items):
+        return sorted(items, key=lambda item: (-item['count'], item['nome']))
+
+    return {
+        'total': sum(area['count'] for area in areas.values()),
+        'areas': by_count(areas.values()),
+        'categorias': by_count(categorias.values()),
+        'subcategorias': by_count(subcategorias),
+        'precos': [
+            {'min': low, 'max': high, 'count': count}
+            for (low, high), count in zip(PRICE_BANDS, band_counts)
+        ],
+    }
@@ -0,0 +1,23 @@
+from django_filters import rest_framework as filters
+from .models import ServicoListing
+
+
+class ServicoListingFilter(filters.FilterSet):
+    """
+    Mesmos parâmetros da listagem de Serviços (?subcategoria=, ?subcategoria__categoria=, ...),
+    aplicados nas colunas da tabela de leitura. ?area= e a faixa de preço atendem os facets.
+    """
+    area = filters.NumberFilter(field_name='area_id')
+    subcategoria = filters.NumberFilter(field_name='subcategoria_id')
+    subcategoria__categoria = filters.NumberFilter(field_name='categoria_id')
+    freelancer_id = filters.NumberFilter(field_name='freelancer_id')
+    status = filters.ChoiceFilter(field_name='status', choices=ServicoListing._meta.get_field('status').choices)
+    preco_inicial__gte = filters.NumberFilter(field_name='preco_inicial', lookup_expr='gte')
+    preco_inicial__lt = filters.NumberFilter(field_name='preco_inicial', lookup_expr='lt')
+
+    class Meta:
+        model = ServicoListing
+        fields = [
+            'area', 'subcategoria', 'subcategoria__categoria', 'freelancer_id', 'status',
+            'preco_inicial__gte', 'preco_inicial__lt',
+        ]
@@ -0,0 +1,72 @@
+from django.db.models import Max, Min
+from .models import Servico, ServicoListing
+
+# Colunas copiadas do Serviço -> coluna na tabela de leitura
+_SOURCE_FIELDS = {
+    'id': 'servico_id',
+    'freelancer_id': 'freelancer_id',
+    'titulo': 'titulo',
+    'slug': 'slug',
+    'imagem_capa': 'imagem_capa',
+    'imagem_capa_variants': 'imagem_capa_variants',
+    'status': 'status',
+    'preco_inicial': 'preco_inicial',
+    'created_at': 'created_at',
+    'subcategoria_id': 'subcategoria_id',
+    'subcategoria__nome': 'subcategoria_nome',
+    'subcategoria__categoria_id': 'categoria_id',
+    'subcategoria__categoria__nome': 'categoria_nome',
+    'subcategoria__categoria__area_id': 'area_id',
+    'subcategoria__categoria__area__nome': 'area_nome',
+}
+_UPDATE_FIELDS = [f for f in _SOURCE_FIELDS.values() if f != 'servico_id'] + ['preco_min', 'preco_max']
+
+
+def sync_listings(servico_ids):
+    """
+    Recalcula a linha de leitura dos Serviços informados: 1 query de leitura (árvore + min/max
+    dos pacotes agregados) e 1 upsert. Serviços que não existem mais são ignorados (o CASCADE já limpou).
+    """
+    rows = Servico.objects.filter(id__in=servico_ids).values(*_SOURCE_FIELDS).annotate(
+        preco_min=Min('pacotes__preco'),
+        preco_max=Max('pacotes__preco'),
+    )
+    listings = [
+        ServicoListing(
+            preco_min=row['preco_min'],
+            preco_max=row['preco_max'],
+            **{target: row[source] for source, target in _SOURCE_FIELDS.items()},
+        )
+        for row in rows
+    ]
+    if listings:
+        ServicoListing.objects.bulk_create(
+            listings,
+            update_conflicts=True,
+            unique_fields=['servico'],
+            update_fields=_UPDATE_FIELDS,
+        )
+    return len(listings)
+
+
+def rename_area(area):
+    ServicoListing.objects.filter(area_id=area.id).update(area_nome=area.nome)
+
+
+def rename_categoria(categoria):
+    ServicoListing.objects.filter(categoria_id=categoria.id).update(
+        categoria_nome=categoria.nome,
+        area_id=categoria.area_id,
+        area_nome=categoria.area.nome,
+    )
+
+
+def rename_subcategoria(subcategoria):
+    categoria = subcategoria.categoria
+    ServicoListing.objects.filter(subcategoria_id=subcategoria.id).update(
+        subcategoria_nome=subcategoria.nome,
+        categoria_id=categoria.id,
+        categoria_nome=categoria.nome,
+        area_id=categoria.area_id,
+        area_nome=categoria.area.nome,
+    )
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from catalog.listing import sync_listings
+from catalog.models import Servico
+
+
+class Command(BaseCommand):
+    help = 'Reconstrói a tabela de leitura da listagem (ServicoListing) a partir dos Serviços'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        ids = list(Servico.objects.order_by('id').values_list('id', flat=True))
+
+        total = 0
+        for start in range(0, len(ids), batch_size):
+            total += sync_listings(ids[start:start + batch_size])
+
+        self.stdout.write(self.style.SUCCESS(f"{total} Serviços sincronizados na listagem."))
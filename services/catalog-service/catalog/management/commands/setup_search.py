@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from catalog.models import SEARCH_CONFIG
+
+
+class Command(BaseCommand):
+    help = (
+        'Cria (se ainda não existirem) as extensões unaccent/pg_trgm e a configuração de busca textual '
+        'usadas pelo Catálogo. Idempotente: roda antes do migrate a cada deploy.'
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic(), connection.cursor() as cursor:
+            # Tudo no schema do serviço (search_path=catalog_db), como o resto das tabelas
+            cursor.execute("SELECT current_schema()")
+            schema = connection.ops.quote_name(cursor.fetchone()[0])
+            config = f"{schema}.{connection.ops.quote_name(SEARCH_CONFIG)}"
+
+            cursor.execute(f"CREATE EXTENSION IF NOT EXISTS unaccent SCHEMA {schema}")
+            cursor.execute(f"CREATE EXTENSION IF NOT EXISTS pg_trgm SCHEMA {schema}")
+
+            # CREATE TEXT SEARCH CONFIGURATION não tem IF NOT EXISTS
+            cursor.execute(
+                "SELECT 1 FROM pg_ts_config WHERE cfgname = %s AND cfgnamespace = current_schema()::regnamespace",
+                [SEARCH_CONFIG],
+            )
+            if cursor.fetchone() is None:
+                cursor.execute(f"CREATE TEXT SEARCH CONFIGURATION {config} (COPY = pg_catalog.portuguese)")
+            # Stemming em português sobre o texto sem acentos (regravar o mapeamento é idempotente)
+            cursor.execute(
+                f"ALTER TEXT SEARCH CONFIGURATION {config} "
+                f"ALTER MAPPING FOR hword, hword_part, word WITH {schema}.unaccent, pg_catalog.portuguese_stem"
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Busca textual configurada ({SEARCH_CONFIG})."))
@@ -1,7 +1,12 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
 from django.utils.text import slugify
 import uuid
 
+# Configuração de busca textual: stemming em português + unaccent (criada pelo comando setup_search)
+SEARCH_CONFIG = 'portuguese_unaccent'
+
 
 # --- 1. ÁREA (Nível Macro: "Design Gráfico", "Programação") ---
 class Area(models.Model):
@@ -73,6 +78,8 @@ class Servico(models.Model):
     slug = models.SlugField(unique=True, blank=True)
     descricao = models.TextField()
     imagem_capa = models.ImageField(upload_to=gig_directory_path)
+    # Miniaturas WebP/AVIF geradas pelo worker (shared.images), o original não vai para a listagem
+    imagem_capa_variants = models.JSONField(default=dict, blank=True, editable=False)
 
     preco_inicial = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='RASCUNHO')
@@ -80,6 +87,23 @@ class Servico(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Mantido pelo próprio Postgres (coluna gerada): título pesa mais que a descrição
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector('titulo', weight='A', config=SEARCH_CONFIG)
+            + SearchVector('descricao', weight='B', config=SEARCH_CONFIG)
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='servico_search_vector_idx'),
+            # Fallback por similaridade (erros de digitação) no título
+            GinIndex(fields=['titulo'], opclasses=['gin_trgm_ops'], name='servico_titulo_trgm_idx'),
+        ]
+
     @property
     def categoria(self):
         return self.subcategoria.categoria
@@ -88,10 +112,14 @@ class Servico(models.Model):
     def area(self):
         return self.subcategoria.categoria.area
 
-    def save(self, *args, **kwargs):
+    def ensure_slug(self):
+        # Também chamado na importação em lote (bulk_create não passa pelo save)
         if not self.slug:
             base_slug = slugify(self.titulo)
             self.slug = f"{base_slug}-{str(uuid.uuid4())[:8]}"
+
+    def save(self, *args, **kwargs):
+        self.ensure_slug()
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -109,4 +137,52 @@ class Pacote(models.Model):
     revisoes = models.PositiveIntegerField(default=1)
 
     class Meta:
-        unique_together = ('servico', 'tipo')
\ No newline at end of file
+        unique_together = ('servico', 'tipo')
+
+# --- 5. LISTAGEM (Tabela de leitura) ---
+class ServicoListing(models.Model):
+    """
+    Cópia desnormalizada de cada Serviço com tudo que a listagem exibe e filtra
+    (nomes da árvore, faixa de preço dos pacotes, capa, status).
+    Listar e filtrar vira um index scan numa única tabela, sem JOINs.
+    Mantida em sincronia por catalog/listing.py (via signals).
+    """
+    servico = models.OneToOneField(Servico, on_delete=models.CASCADE, primary_key=True, related_name='listing')
+    freelancer_id = models.BigIntegerField()
+
+    titulo = models.CharField(max_length=200)
+    slug = models.SlugField(db_index=False)
+    imagem_capa = models.ImageField()
+    imagem_capa_variants = models.JSONField(default=dict)
+    status = models.CharField(max_length=20, choices=Servico.STATUS_CHOICES)
+
+    preco_inicial = models.DecimalField(max_digits=10, decimal_places=2)
+    preco_min = models.DecimalField(max_digits=10, decimal_places=2, null=True)  # Pacote mais barato
+    preco_max = models.DecimalField(max_digits=10, decimal_places=2, null=True)  # Pacote mais caro
+
+    area_id = models.IntegerField()
+    area_nome = models.CharField(max_length=100)
+    categoria_id = models.IntegerField()
+    categoria_nome = models.CharField(max_length=100)
+    subcategoria_id = models.IntegerField()
+    subcategoria_nome = models.CharField(max_length=100)
+
+    created_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # Um índice por ordenação permitida (created_at, preco_inicial), com a PK de desempate
+            # do cursor; o Postgres percorre o mesmo índice ao contrário na ordem decrescente
+            models.Index(fields=['created_at', 'servico'], name='listing_created_idx'),
+            models.Index(fields=['preco_inicial', 'servico'], name='listing_preco_idx'),
+            # Filtros da listagem (+ status) seguidos da ordenação
+            models.Index(fields=['subcategoria_id', 'status', 'created_at', 'servico'], name='listing_subcat_created_idx'),
+            models.Index(fields=['subcategoria_id', 'status', 'preco_inicial', 'servico'], name='listing_subcat_preco_idx'),
+            models.Index(fields=['categoria_id', 'status', 'created_at', 'servico'], name='listing_cat_created_idx'),
+            models.Index(fields=['categoria_id', 'status', 'preco_inicial', 'servico'], name='listing_cat_preco_idx'),
+            models.Index(fields=['freelancer_id', 'status'], name='listing_freelancer_idx'),
+        ]
+
+    def __str__(self):
+        return self.titulo
@@ -0,0 +1,64 @@
+import hashlib
+import json
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+from shared.pagination import KeysetPagination as BaseKeysetPagination
+
+
+def query_cache_key(namespace, request, exclude=('cursor', 'page_size', 'ordering')):
+    """Chave de cache por combinação de filtros da requisição (ignora paginação e ordenação)."""
+    params = sorted((key, value) for key, value in request.query_params.lists() if key not in exclude)
+    raw = f"{request.path}?{json.dumps(params)}"
+    return f"{namespace}:{hashlib.sha1(raw.encode('utf-8')).hexdigest()}"
+
+
+class KeysetPagination(BaseKeysetPagination):
+    """
+    Paginação por cursor (keyset) para a vitrine e a busca de Gigs (scroll infinito).
+    Segue a ordenação já aplicada ao queryset (OrderingFilter ou relevância da busca) e
+    desempata pela PK.
+
+    O total ('count') só vem na primeira página e sai do cache por combinação de filtros:
+    é aproximado (pode estar até COUNT_CACHE_TTL segundos atrasado), mas não refaz COUNT(*) a cada scroll.
+    """
+    page_size = 12
+    max_page_size = 48
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        position = self.decode_cursor(request, queryset)
+
+        self.count = None
+        if position is None:
+            self.count = self.get_count(queryset, request)
+        else:
+            queryset = self.filter_after(queryset, position)
+
+        return self.set_page(list(queryset.order_by(*self.ordering)[:self.page_size + 1]))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.count,
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties'] = {'count': {'type': 'integer', 'nullable': True}, **response_schema['properties']}
+        return response_schema
+
+    def get_ordering(self, queryset):
+        """Ordenação do queryset (ou a padrão do model) + PK como desempate, na direção da primeira coluna."""
+        ordering = [f for f in (queryset.query.order_by or queryset.model._meta.ordering) if isinstance(f, str)]
+        ordering = [f for f in ordering if f.lstrip('-') != 'pk'] or ['-pk']
+        if ordering[-1].lstrip('-') != 'pk':
+            ordering.append('-pk' if ordering[0].startswith('-') else 'pk')
+        return ordering
+
+    def get_count(self, queryset, request):
+        key = query_cache_key('catalog:count', request)
+        return cache.get_or_set(key, queryset.count, timeout=settings.CATALOG_COUNT_CACHE_TTL)
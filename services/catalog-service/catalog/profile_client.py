@@ -0,0 +1,52 @@
+import logging
+import threading
+import requests
+from django.conf import settings
+from shared.http import CircuitBreaker, pooled_session
+
+logger = logging.getLogger(__name__)
+
+
+class ProfileClient:
+    """
+    Cliente interno do Profile Service, usado para embutir o cartão do vendedor nas listagens.
+    Falha nunca derruba a listagem: sem resposta, os cartões simplesmente não vêm.
+    """
+    TIMEOUT = (0.5, 1)  # (conexão, leitura): a listagem não espera mais que isso pelos cartões
+    POOL_SIZE = 10  # Conexões keep-alive por worker
+
+    breaker = CircuitBreaker()
+    _session = None
+    _session_lock = threading.Lock()
+
+    @classmethod
+    def _get_session(cls):
+        # Criada sob demanda: cada worker (pós-fork do gunicorn/celery) tem seu próprio pool
+        if cls._session is None:
+            with cls._session_lock:
+                if cls._session is None:
+                    cls._session = pooled_session(cls.POOL_SIZE)
+        return cls._session
+
+    @classmethod
+    def get_cards(cls, freelancer_ids):
+        """Retorna {freelancer_id: cartão} em uma única chamada (o Profile Service responde do Redis)."""
+        ids = sorted({pk for pk in freelancer_ids if pk is not None})
+        if not ids or not cls.breaker.allow():
+            return {}
+
+        try:
+            response = cls._get_session().get(
+                f"{settings.PROFILE_SERVICE_URL}/freelancers/cards/",
+                params={'ids': ','.join(map(str, ids))},
+                timeout=cls.TIMEOUT,
+            )
+            response.raise_for_status()
+            cards = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            cls.breaker.record_failure()
+            logger.warning(f"Cartões de vendedor indisponíveis: {e}")
+            return {}
+
+        cls.breaker.record_success()
+        return {card['id']: card for card in cards}
@@ -0,0 +1,56 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+from rest_framework.filters import BaseFilterBackend
+from .models import SEARCH_CONFIG, ServicoListing
+
+
+def _as_float(rank):
+    # ts_rank/similarity devolvem real (float4); em double precision o valor volta idêntico
+    # no cursor da paginação (comparar float4 com o float do Python nunca dá igual)
+    return Cast(rank, FloatField())
+
+
+def search_servicos(queryset, term):
+    """
+    Busca textual em Serviços, ordenada por relevância.
+    1. tsvector (índice GIN) com stemming em português e sem acentos;
+    2. se nada casar, cai para similaridade de trigramas no título (erros de digitação).
+    Aceita querysets de Servico ou da tabela de leitura (ServicoListing, que busca pelo Serviço via PK).
+    """
+    prefix = 'servico__' if queryset.model is ServicoListing else ''
+    query = SearchQuery(term, config=SEARCH_CONFIG, search_type='websearch')
+    results = queryset.filter(**{f'{prefix}search_vector': query}).annotate(
+        rank=_as_float(SearchRank(F(f'{prefix}search_vector'), query))
+    ).order_by('-rank', '-created_at')
+
+    if results.exists():
+        return results
+
+    # Operador % do pg_trgm (similaridade >= pg_trgm.similarity_threshold, padrão 0.3), usa o índice GIN
+    return queryset.filter(**{f'{prefix}titulo__trigram_similar': term}).annotate(
+        rank=_as_float(TrigramSimilarity(f'{prefix}titulo', term))
+    ).order_by('-rank', '-created_at')
+
+
+class ServicoSearchFilter(BaseFilterBackend):
+    """Substitui o SearchFilter do DRF (ILIKE '%termo%') pela busca textual indexada."""
+    search_param = 'search'
+
+    def get_search_term(self, request):
+        return request.query_params.get(self.search_param, '').strip()
+
+    def filter_queryset(self, request, queryset, view):
+        term = self.get_search_term(request)
+        if not term:
+            return queryset
+        return search_servicos(queryset, term)
+
+    def get_schema_operation_parameters(self, view):
+        return [{
+            'name': self.search_param,
+            'required': False,
+            'in': 'query',
+            'description': 'Busca textual (título e descrição), ordenada por relevância.',
+            'schema': {'type': 'string'},
+        }]
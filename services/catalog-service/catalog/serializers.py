@@ -1,5 +1,33 @@
+from django.db import transaction
 from rest_framework import serializers
-from .models import Area, Categoria, Subcategoria, Servico, Pacote
+from shared.images import ImageVariantsField
+from shared.uploads import validate_uploaded_key
+from .listing import sync_listings
+from .models import Area, Categoria, Subcategoria, Servico, Pacote, ServicoListing
+
+def upload_prefix(user_id):
+    """Prefixo dos uploads diretos (URL assinada) de capas de um freelancer."""
+    return f'gigs/user_{user_id}/uploads'
+
+
+# Campos do Pacote regravados no upsert por (servico, tipo)
+PACOTE_UPDATE_FIELDS = ['nome', 'descricao', 'preco', 'prazo_entrega_dias', 'revisoes']
+# Obrigatórios para criar um tipo de pacote novo (inclusive num PATCH)
+PACOTE_REQUIRED_FIELDS = ['nome', 'descricao', 'preco', 'prazo_entrega_dias']
+
+
+def upsert_pacotes(pacotes):
+    """
+    Grava Pacotes (de um ou vários Serviços) em um único INSERT ... ON CONFLICT (servico, tipo) DO UPDATE.
+    bulk_create não dispara signals: quem chama sincroniza a listagem (sync_listings).
+    """
+    if pacotes:
+        Pacote.objects.bulk_create(
+            pacotes,
+            update_conflicts=True,
+            unique_fields=['servico', 'tipo'],
+            update_fields=PACOTE_UPDATE_FIELDS,
+        )
 
 
 class SubcategoriaSerializer(serializers.ModelSerializer):
@@ -40,33 +68,166 @@ class ServicoDetailSerializer(serializers.ModelSerializer):
         queryset=Subcategoria.objects.all(), source='subcategoria', write_only=True
     )
     pacotes = PacoteSerializer(many=True)
+    imagem_capa = serializers.ImageField(required=False)
+    imagem_capa_variants = ImageVariantsField('imagem_capa')
+    # Alternativa ao upload multipart: chave de um arquivo já enviado direto ao MinIO (/servicos/uploads/)
+    imagem_capa_key = serializers.CharField(write_only=True, required=False, max_length=100)
 
     class Meta:
         model = Servico
         fields = [
-            'id', 'titulo', 'slug', 'descricao', 'imagem_capa',
+            'id', 'titulo', 'slug', 'descricao', 'imagem_capa', 'imagem_capa_variants', 'imagem_capa_key',
             'preco_inicial', 'status', 'freelancer_id',
             'area', 'categoria', 'subcategoria', 'subcategoria_id',
             'pacotes', 'created_at'
         ]
+        read_only_fields = ['freelancer_id']  # Vem do usuário autenticado (perform_create)
+
+    def validate_imagem_capa_key(self, value):
+        return validate_uploaded_key(value, upload_prefix(self.context['request'].user.id))
+
+    def validate(self, attrs):
+        key = attrs.pop('imagem_capa_key', None)
+        if key:
+            attrs['imagem_capa'] = key
+        if self.instance is None and not attrs.get('imagem_capa'):
+            raise serializers.ValidationError({'imagem_capa': 'Envie a imagem de capa (arquivo ou imagem_capa_key).'})
+        return attrs
+
+    def validate_pacotes(self, value):
+        # O tipo identifica o pacote no upsert: obrigatório mesmo num PATCH (que deixa os campos do filho opcionais)
+        if any('tipo' not in pacote for pacote in value):
+            raise serializers.ValidationError("Informe o tipo de cada pacote.")
+        tipos = [pacote['tipo'] for pacote in value]
+        if len(tipos) != len(set(tipos)):
+            raise serializers.ValidationError("Cada tipo de pacote só pode aparecer uma vez.")
+
+        if self.partial:
+            # PATCH num tipo que ainda não existe cria o pacote: aí os campos obrigatórios têm que vir
+            existing = set(self.instance.pacotes.values_list('tipo', flat=True)) if self.instance else set()
+            for pacote in value:
+                missing = [f for f in PACOTE_REQUIRED_FIELDS if f not in pacote]
+                if pacote['tipo'] not in existing and missing:
+                    raise serializers.ValidationError(
+                        f"Pacote {pacote['tipo']} novo: informe {', '.join(missing)}."
+                    )
+        return value
 
     def create(self, validated_data):
         pacotes_data = validated_data.pop('pacotes')
-        servico = Servico.objects.create(**validated_data)
-        for pacote in pacotes_data:
-            Pacote.objects.create(servico=servico, **pacote)
+        with transaction.atomic():
+            servico = Servico.objects.create(**validated_data)
+            upsert_pacotes([Pacote(servico=servico, **pacote) for pacote in pacotes_data])
+            sync_listings([servico.id])
+        return servico
+
+    def update(self, instance, validated_data):
+        """
+        Atualiza o Serviço e faz upsert dos pacotes enviados por tipo.
+        PUT substitui o conjunto (tipos ausentes são removidos); PATCH só mexe nos tipos enviados.
+        """
+        pacotes_data = validated_data.pop('pacotes', None)
+        with transaction.atomic():
+            servico = super().update(instance, validated_data)
+            if pacotes_data is not None:
+                if self.partial:
+                    # Mescla só os campos enviados no pacote existente: o upsert regrava todos os campos
+                    existing = {p.tipo: p for p in servico.pacotes.all()}
+                    pacotes = []
+                    for data in pacotes_data:
+                        pacote = existing.get(data['tipo']) or Pacote(servico=servico)
+                        for field, value in data.items():
+                            setattr(pacote, field, value)
+                        pacotes.append(pacote)
+                else:
+                    pacotes = [Pacote(servico=servico, **pacote) for pacote in pacotes_data]
+                upsert_pacotes(pacotes)
+                if not self.partial:
+                    servico.pacotes.exclude(tipo__in=[p['tipo'] for p in pacotes_data]).delete()
+                sync_listings([servico.id])
         return servico
 
 
+class ServicoImportListSerializer(serializers.ListSerializer):
+    """Importação em lote: todos os Serviços, todos os Pacotes e a listagem em poucas queries e uma transação."""
+
+    def to_internal_value(self, data):
+        # Uma query para validar as subcategorias de todos os itens (em vez de uma por item)
+        ids = set()
+        for item in data:
+            if isinstance(item, dict):
+                # Mesma conversão do IntegerField do item ("3" vale); ids inválidos dão erro na validação do item
+                try:
+                    ids.add(serializers.IntegerField().to_internal_value(item.get('subcategoria_id')))
+                except serializers.ValidationError:
+                    pass
+        self.subcategoria_ids = set(
+            Subcategoria.objects.filter(id__in=ids).values_list('id', flat=True)
+        )
+        return super().to_internal_value(data)
+
+    def create(self, validated_data):
+        servicos, pacotes_data = [], []
+        for item in validated_data:
+            pacotes_data.append(item.pop('pacotes'))
+            servico = Servico(**item)
+            servico.ensure_slug()
+            servicos.append(servico)
+
+        with transaction.atomic():
+            Servico.objects.bulk_create(servicos)
+            upsert_pacotes([
+                Pacote(servico=servico, **pacote)
+                for servico, pacotes in zip(servicos, pacotes_data)
+                for pacote in pacotes
+            ])
+            sync_listings([servico.id for servico in servicos])
+            transaction.on_commit(lambda: self._schedule_covers(servicos))
+        return servicos
+
+    @staticmethod
+    def _schedule_covers(servicos):
+        # bulk_create não dispara o signal que agenda as miniaturas
+        from .tasks import process_servico_cover
+        for servico in servicos:
+            if servico.imagem_capa:
+                process_servico_cover.delay(servico.id)
+
+
+class ServicoImportSerializer(ServicoDetailSerializer):
+    """
+    Um item da importação em lote (agências). Sem upload de arquivo: a capa é opcional e vem
+    como imagem_capa_key de um upload direto (a capa pode ser enviada depois).
+    """
+    imagem_capa = serializers.ImageField(read_only=True)
+    subcategoria_id = serializers.IntegerField(write_only=True)
+
+    class Meta(ServicoDetailSerializer.Meta):
+        list_serializer_class = ServicoImportListSerializer
+
+    def validate_imagem_capa_key(self, value):
+        # Só o prefixo do usuário: um HEAD no bucket por item deixaria a importação lenta
+        return validate_uploaded_key(value, upload_prefix(self.context['request'].user.id), check_exists=False)
+
+    def validate(self, attrs):
+        attrs['imagem_capa'] = attrs.pop('imagem_capa_key', '')
+        return attrs
+
+    def validate_subcategoria_id(self, value):
+        if value not in self.parent.subcategoria_ids:
+            raise serializers.ValidationError("Subcategoria não encontrada.")
+        return value
+
+
 class ServicoListSerializer(serializers.ModelSerializer):
-    area_nome = serializers.CharField(source='subcategoria.categoria.area.nome', read_only=True)
-    categoria_nome = serializers.CharField(source='subcategoria.categoria.nome', read_only=True)
-    subcategoria_nome = serializers.CharField(source='subcategoria.nome', read_only=True)
+    # Lê da tabela de leitura (ServicoListing): nada de JOIN na árvore nem prefetch de pacotes
+    id = serializers.IntegerField(source='servico_id', read_only=True)
+    imagem_capa_variants = ImageVariantsField('imagem_capa')
 
     class Meta:
-        model = Servico
+        model = ServicoListing
         fields = [
-            'id', 'titulo', 'slug', 'imagem_capa',
-            'preco_inicial', 'freelancer_id',
+            'id', 'titulo', 'slug', 'imagem_capa', 'imagem_capa_variants',
+            'preco_inicial', 'preco_min', 'preco_max', 'freelancer_id',
             'area_nome', 'categoria_nome', 'subcategoria_nome'
-        ]
\ No newline at end of file
+        ]
@@ -0,0 +1,58 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Area, Categoria, Subcategoria, Servico, Pacote
+from shared.images import needs_variants
+from .listing import sync_listings, rename_area, rename_categoria, rename_subcategoria
+from .tree import invalidate_tree
+
+
+@receiver([post_save, post_delete], sender=Area)
+@receiver([post_save, post_delete], sender=Categoria)
+@receiver([post_save, post_delete], sender=Subcategoria)
+def invalidate_category_tree(sender, **kwargs):
+    # Depois do COMMIT: antes dele, uma leitura concorrente remontaria (e guardaria) a árvore antiga
+    transaction.on_commit(invalidate_tree)
+
+
+# --- Tabela de leitura da listagem (ServicoListing) ---
+
+@receiver(post_save, sender=Servico)
+def sync_servico_listing(sender, instance, raw=False, **kwargs):
+    if not raw:
+        sync_listings([instance.id])
+
+
+@receiver(post_save, sender=Servico)
+def schedule_cover_variants(sender, instance, raw=False, **kwargs):
+    # Capa nova: as miniaturas são geradas pelo worker, depois do COMMIT
+    if not raw and needs_variants(instance.imagem_capa, instance.imagem_capa_variants):
+        from .tasks import process_servico_cover
+        transaction.on_commit(lambda: process_servico_cover.delay(instance.id))
+
+
+@receiver([post_save, post_delete], sender=Pacote)
+def sync_pacote_listing(sender, instance, raw=False, origin=None, **kwargs):
+    # Pacote apagado em cascata junto com o Serviço: a linha de leitura vai junto
+    if raw or getattr(origin, 'model', type(origin)) is Servico:
+        return
+    # Pacote mudou: recalcula a faixa de preço do Serviço
+    sync_listings([instance.servico_id])
+
+
+@receiver(post_save, sender=Area)
+def rename_area_listing(sender, instance, created, raw=False, **kwargs):
+    if not (created or raw):
+        rename_area(instance)
+
+
+@receiver(post_save, sender=Categoria)
+def rename_categoria_listing(sender, instance, created, raw=False, **kwargs):
+    if not (created or raw):
+        rename_categoria(instance)
+
+
+@receiver(post_save, sender=Subcategoria)
+def rename_subcategoria_listing(sender, instance, created, raw=False, **kwargs):
+    if not (created or raw):
+        rename_subcategoria(instance)
@@ -0,0 +1,27 @@
+from celery import shared_task
+from shared.images import process_image_field
+from .models import Servico, ServicoListing
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name='catalog.process_cover', bind=True, max_retries=3)
+def process_servico_cover(self, servico_id):
+    """
+    Gera as variantes WebP/AVIF da capa do Gig e copia para a tabela de leitura da listagem.
+    Idempotente: se a capa atual já tem variantes, não faz nada.
+    """
+    servico = Servico.objects.filter(id=servico_id).only('id', 'imagem_capa', 'imagem_capa_variants').first()
+    if servico is None:
+        return
+
+    try:
+        variants = process_image_field(servico, 'imagem_capa', 'imagem_capa_variants')
+    except Exception as e:
+        logger.error(f"Erro ao gerar variantes da capa do Gig {servico_id}: {str(e)}")
+        raise self.retry(exc=e, countdown=2 ** self.request.retries)
+
+    if variants is not None:
+        ServicoListing.objects.filter(servico_id=servico_id).update(imagem_capa_variants=variants)
+        logger.info(f"Variantes da capa do Gig {servico_id} geradas.")
@@ -0,0 +1,48 @@
+import hashlib
+import json
+from django.conf import settings
+from django.core.cache import cache
+from .models import Area, Categoria, Subcategoria
+
+TREE_CACHE_KEY = 'catalog:tree'
+
+
+def build_tree():
+    """
+    Monta a árvore Área > Categoria > Subcategoria em exatamente 3 queries
+    (uma por nível, só com as colunas usadas), no mesmo formato do AreaSerializer.
+    """
+    subcategorias = {}
+    for sub in Subcategoria.objects.order_by('id').values('id', 'nome', 'slug', 'categoria_id'):
+        categoria_id = sub.pop('categoria_id')
+        subcategorias.setdefault(categoria_id, []).append(sub)
+
+    categorias = {}
+    for cat in Categoria.objects.order_by('id').values('id', 'nome', 'slug', 'icone', 'area_id'):
+        area_id = cat.pop('area_id')
+        cat['subcategorias'] = subcategorias.get(cat['id'], [])
+        categorias.setdefault(area_id, []).append(cat)
+
+    return [
+        {**area, 'categorias': categorias.get(area['id'], [])}
+        for area in Area.objects.order_by('id').values('id', 'nome', 'slug')
+    ]
+
+
+def get_tree():
+    """
+    Retorna (json_bytes, etag) da árvore. Serializada uma vez e guardada pronta no cache;
+    o ETag é o hash do conteúdo, então muda sempre que a árvore muda.
+    """
+    cached = cache.get(TREE_CACHE_KEY)
+    if cached is not None:
+        return cached
+
+    body = json.dumps(build_tree(), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    etag = f'"{hashlib.sha1(body).hexdigest()}"'
+    cache.set(TREE_CACHE_KEY, (body, etag), timeout=settings.CATALOG_TREE_CACHE_TTL)
+    return body, etag
+
+
+def invalidate_tree():
+    cache.delete(TREE_CACHE_KEY)
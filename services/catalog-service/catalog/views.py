@@ -1,12 +1,31 @@
-from rest_framework import viewsets, filters
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified
+from rest_framework import viewsets, filters, status
+from rest_framework.decorators import action
+from rest_framework.permissions import AllowAny, IsAuthenticatedOrReadOnly
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import Area, Categoria, Subcategoria, Servico
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from shared.uploads import UploadRequestSerializer, presigned_upload
+from .models import Area, Categoria, Subcategoria, Servico, ServicoListing
+from .events import gig_fingerprint, publish_gig_changed
+from .facets import compute_facets
+from .filters import ServicoListingFilter
+from .pagination import KeysetPagination, query_cache_key
+from .profile_client import ProfileClient
+from .search import ServicoSearchFilter, search_servicos
+from .tree import get_tree
 from .serializers import (
     AreaSerializer,
     CategoriaSerializer,
     SubcategoriaSerializer,
     ServicoDetailSerializer,
-    ServicoListSerializer
+    ServicoImportSerializer,
+    ServicoListSerializer,
+    upload_prefix
 )
 
 
@@ -17,6 +36,27 @@ class AreaViewSet(viewsets.ReadOnlyModelViewSet):
     pagination_class = None
 
 
+class CategoryTreeView(APIView):
+    """
+    Árvore completa Área > Categoria > Subcategoria para o menu do frontend.
+    Servida pronta do cache, com ETag: se o cliente já tem a versão atual, responde 304 sem corpo.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        body, etag = get_tree()
+
+        if etag in request.headers.get('If-None-Match', ''):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(body, content_type='application/json')
+
+        response['ETag'] = etag
+        response['Cache-Control'] = 'public, no-cache'  # Sempre revalida, mas o 304 é barato
+        return response
+
+
 class CategoriaViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Categoria.objects.all()
     serializer_class = CategoriaSerializer
@@ -30,22 +70,138 @@ class SubcategoriaViewSet(viewsets.ReadOnlyModelViewSet):
 
 
 class ServicoViewSet(viewsets.ModelViewSet):
+    # search_vector só é usado dentro do banco (filtro/rank): não precisa trafegar
     queryset = Servico.objects.all().select_related(
         'subcategoria__categoria__area'
-    ).prefetch_related('pacotes')
+    ).prefetch_related('pacotes').defer('search_vector')
 
     lookup_field = 'slug'
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    # Leitura é pública; escrita exige o JWT (usuário montado do token por shared.auth, sem banco)
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    # Cursor em vez de ?page=: scroll infinito sem OFFSET nem COUNT(*) a cada página
+    pagination_class = KeysetPagination
+    # ?search= usa a busca textual indexada (tsvector + GIN), não ILIKE
+    filter_backends = [DjangoFilterBackend, ServicoSearchFilter, filters.OrderingFilter]
 
     # Filtros atualizados para a nova estrutura
     filterset_fields = ['subcategoria', 'subcategoria__categoria', 'freelancer_id', 'status']
-    search_fields = ['titulo', 'descricao']
     ordering_fields = ['preco_inicial', 'created_at']
 
+    # Ações servidas pela tabela de leitura (ServicoListing)
+    listing_actions = ('list', 'search', 'facets')
+
+    @property
+    def filterset_class(self):
+        # Mesmos parâmetros de filterset_fields, mas nas colunas da tabela de leitura
+        return ServicoListingFilter if self.action in self.listing_actions else None
+
+    def get_queryset(self):
+        if self.action in self.listing_actions:
+            return ServicoListing.objects.all()
+        return super().get_queryset()
+
     def get_serializer_class(self):
-        if self.action == 'list':
+        if self.action in self.listing_actions:
             return ServicoListSerializer
         return ServicoDetailSerializer
 
+    def embed_freelancers(self, response):
+        """
+        ?embed=freelancer: embute o cartão do vendedor (nome e foto) em cada item da página,
+        com uma única chamada ao Profile Service, em vez de uma requisição por Gig no frontend.
+        """
+        if self.request.query_params.get('embed') != 'freelancer':
+            return response
+
+        results = response.data['results']
+        cards = ProfileClient.get_cards(item['freelancer_id'] for item in results)
+        for item in results:
+            item['freelancer'] = cards.get(item['freelancer_id'])
+        return response
+
+    @extend_schema(parameters=[OpenApiParameter('embed', OpenApiTypes.STR, enum=['freelancer'])])
+    def list(self, request, *args, **kwargs):
+        return self.embed_freelancers(super().list(request, *args, **kwargs))
+
+    @extend_schema(parameters=[OpenApiParameter('embed', OpenApiTypes.STR, enum=['freelancer'])])
+    @action(detail=False, methods=['get'], url_path='search')
+    def search(self, request):
+        """
+        Busca de Gigs por relevância: /api/catalog/servicos/search/?q=termo
+        Aceita os mesmos filtros da listagem (subcategoria, status, ...).
+        """
+        term = request.query_params.get('q', '').strip()
+        if not term:
+            return Response({"error": "Informe o termo de busca (?q=)."}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = DjangoFilterBackend().filter_queryset(request, self.get_queryset(), self)
+        page = self.paginate_queryset(search_servicos(queryset, term))
+        serializer = self.get_serializer(page, many=True)
+        return self.embed_freelancers(self.get_paginated_response(serializer.data))
+
+    @extend_schema(responses={200: OpenApiTypes.OBJECT})
+    @action(detail=False, methods=['get'], url_path='facets', pagination_class=None)
+    def facets(self, request):
+        """
+        Contagens por área/categoria/subcategoria/faixa de preço para a vitrine:
+        /api/catalog/servicos/facets/?subcategoria__categoria=3&search=logo
+        Aceita os mesmos filtros da listagem; o resultado fica em cache por combinação de filtros.
+        """
+        key = query_cache_key('catalog:facets', request)
+        data = cache.get(key)
+        if data is None:
+            data = compute_facets(self.filter_queryset(self.get_queryset()))
+            cache.set(key, data, timeout=settings.CATALOG_FACETS_CACHE_TTL)
+        return Response(data)
+
+    # Limite de Serviços por requisição na importação em lote
+    import_max_items = 500
+
+    @extend_schema(request=ServicoImportSerializer(many=True), responses={201: OpenApiTypes.OBJECT})
+    @action(detail=False, methods=['post'], url_path='import')
+    def bulk_import(self, request):
+        """
+        Importação em lote para agências: POST /api/catalog/servicos/import/ com uma lista de Gigs
+        (mesmo formato da criação, com pacotes). Tudo ou nada, em uma única transação.
+        """
+        if not isinstance(request.data, list) or not request.data:
+            return Response({"error": "Envie uma lista de serviços."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(request.data) > self.import_max_items:
+            return Response(
+                {"error": f"Máximo de {self.import_max_items} serviços por importação."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        serializer = ServicoImportSerializer(data=request.data, many=True, context=self.get_serializer_context())
+        serializer.is_valid(raise_exception=True)
+        servicos = serializer.save(freelancer_id=self.request.user.id)
+        return Response(
+            {"created": len(servicos), "slugs": [servico.slug for servico in servicos]},
+            status=status.HTTP_201_CREATED
+        )
+
+    @extend_schema(request=UploadRequestSerializer, responses={201: OpenApiTypes.OBJECT})
+    @action(detail=False, methods=['post'], url_path='uploads')
+    def uploads(self, request):
+        """
+        Upload direto da capa: devolve um POST assinado para o MinIO. O arquivo não passa pelo Django;
+        depois a chave vai em imagem_capa_key na criação/edição do Gig.
+        """
+        serializer = UploadRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = presigned_upload(upload_prefix(request.user.id), **serializer.validated_data)
+        return Response(data, status=status.HTTP_201_CREATED)
+
     def perform_create(self, serializer):
-        serializer.save(freelancer_id=self.request.user.id)
\ No newline at end of file
+        serializer.save(freelancer_id=self.request.user.id)
+
+    def perform_update(self, serializer):
+        before = gig_fingerprint(serializer.instance)
+        servico = serializer.save()
+        if gig_fingerprint(servico) != before:
+            publish_gig_changed(servico.id, servico.slug)
+
+    def perform_destroy(self, instance):
+        servico_id, slug = instance.id, instance.slug
+        instance.delete()
+        publish_gig_changed(servico_id, slug)
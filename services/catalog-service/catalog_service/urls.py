@@ -4,7 +4,7 @@ from rest_framework.routers import DefaultRouter
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
 
 # CORREÇÃO: Importar de 'catalog' em vez de 'core'
-from catalog.views import AreaViewSet, CategoriaViewSet, SubcategoriaViewSet, ServicoViewSet
+from catalog.views import AreaViewSet, CategoriaViewSet, SubcategoriaViewSet, ServicoViewSet, CategoryTreeView
 
 router = DefaultRouter()
 router.register(r'areas', AreaViewSet)
@@ -14,6 +14,7 @@ router.register(r'servicos', ServicoViewSet)
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('api/catalog/tree/', CategoryTreeView.as_view(), name='catalog-tree'),
     path('api/catalog/', include(router.urls)), # Prefixo api/catalog já está no router do Traefik, mas manter aqui é boa prática
 
     # Swagger
@@ -1,56 +1,95 @@
 import os
-from abacatepay import AbacatePay  # SDK oficial
-from .finance import FinanceCalculator
+import requests
+from abacatepay.constants import BASE_URL, USER_AGENT
+from abacatepay.utils.exceptions import raise_for_status
 
 
 class AbacatePayService:
+    TIMEOUT = (3, 15)  # (conexão, leitura)
+
     def __init__(self):
         self.api_key = os.environ.get('ABACATEPAY_API_KEY', '')
-        # Inicializa o cliente do SDK
-        self.client = AbacatePay(self.api_key)
+
+    @property
+    def mocked(self):
+        return not self.api_key or self.api_key == "dummy_key"
+
+    @property
+    def headers(self):
+        return {'Authorization': f'Bearer {self.api_key}', 'User-Agent': USER_AGENT}
+
+    @staticmethod
+    def external_id(order):
+        """Identificador do pedido no produto da cobrança: é por ele que find_billing acha a cobrança."""
+        return f"order-{order.id}"
+
+    def find_billing(self, order):
+        """
+        Procura no AbacatePay uma cobrança já criada para o pedido (pelo externalId do produto).
+        Usado antes de criar de novo quando uma tentativa anterior pode ter perdido a resposta.
+        Retorna o mesmo formato de create_billing, ou None se o gateway não tem cobrança para o pedido.
+        As requisições são feitas aqui (com as constantes e os erros do SDK) porque o SDK não tem timeout.
+        """
+        if self.mocked:
+            return None
+
+        response = requests.get(f'{BASE_URL}/billing/list', headers=self.headers, timeout=self.TIMEOUT)
+        raise_for_status(response)
+        external_id = self.external_id(order)
+        for billing in response.json()['data']:
+            if billing.get('status') in ('CANCELLED', 'EXPIRED'):
+                continue
+            if any(product.get('externalId') == external_id for product in billing.get('products', [])):
+                return {"id": billing['id'], "url": billing['url'], "status": billing.get('status')}
+        return None
 
     def create_billing(self, order, customer_data):
         """
-        Cria uma cobrança Pix usando o SDK do AbacatePay.
+        Cria uma cobrança Pix no AbacatePay.
+        O gateway não deduplica: cada chamada cria uma cobrança nova. Quem chama de novo depois de
+        uma falha deve procurar antes com find_billing.
         """
-        if not self.api_key or self.api_key == "dummy_key":
+        if self.mocked:
             return self._mock_response(order)
 
         try:
-            # 1. Calculamos o Split (apenas para registro interno ou metadata por enquanto)
+            # O split já foi calculado na criação do pedido (order.platform_fee/freelancer_net).
             # O AbacatePay receberá o valor CHEIO do cliente.
-            fees = FinanceCalculator.calculate_fees(order.amount)
-
-            # 2. Prepara os dados conforme o SDK espera
             # Convertemos o pedido em um "Produto" para aparecer bonito na fatura
             amount_in_cents = int(order.amount * 100)
 
-            billing = self.client.billing.create(
-                frequency="ONE_TIME",
-                methods=["PIX"],
-                products=[
-                    {
-                        "externalId": str(order.service.id),  # ID do Gig
-                        "name": f"Serviço: {order.service.title}",
-                        "quantity": 1,
-                        "price": amount_in_cents,
-                        "description": f"Pedido #{order.id} via Lykos"
-                    }
-                ],
-                customer={
-                    "name": customer_data.get('name'),
-                    "email": customer_data.get('email'),
-                    "taxId": customer_data.get('taxId', '00000000000')  # CPF/CNPJ
+            response = requests.post(
+                f'{BASE_URL}/billing/create',
+                json={
+                    "frequency": "ONE_TIME",
+                    "methods": ["PIX"],
+                    "products": [
+                        {
+                            "externalId": self.external_id(order),  # ID do pedido (find_billing)
+                            "name": f"Serviço: {order.package_title}",
+                            "quantity": 1,
+                            "price": amount_in_cents,
+                            "description": f"Pedido #{order.id} via Lykos"
+                        }
+                    ],
+                    "customer": {
+                        "name": customer_data.get('name'),
+                        "email": customer_data.get('email'),
+                        "taxId": customer_data.get('taxId', '00000000000')  # CPF/CNPJ
+                    },
+                    "returnUrl": f"https://lykos.com.br/u/orders/{order.id}",  # Redirecionamento pós-pagamento
+                    "completionUrl": "https://api.lykos.com.br/api/v1/webhooks/abacatepay",  # Webhook
                 },
-                returnURL=f"https://lykos.com.br/u/orders/{order.id}",  # Redirecionamento pós-pagamento
-                completionUrl=f"https://api.lykos.com.br/api/v1/webhooks/abacatepay"  # Webhook
+                headers=self.headers,
+                timeout=self.TIMEOUT,
             )
+            raise_for_status(response)
+            billing = response.json()['data']
 
-            # O SDK retorna um objeto Billing, acessamos os dados dele
             return {
-                "id": billing.data.id,
-                "url": billing.data.url,
-                "status": billing.data.status
+                "id": billing['id'],
+                "url": billing['url'],
+                "status": billing.get('status')
             }
 
         except Exception as e:
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Order, Transaction
+from .models import Order, Transaction, WebhookEvent, FeeTier
 
 @admin.register(Order)
 class OrderAdmin(admin.ModelAdmin):
@@ -8,4 +8,14 @@ class OrderAdmin(admin.ModelAdmin):
 
 @admin.register(Transaction)
 class TransactionAdmin(admin.ModelAdmin):
-    list_display = ('external_id', 'order', 'status', 'created_at')
\ No newline at end of file
+    list_display = ('external_id', 'order', 'status', 'created_at')
+
+@admin.register(WebhookEvent)
+class WebhookEventAdmin(admin.ModelAdmin):
+    list_display = ('event_id', 'event_type', 'status', 'received_at', 'processed_at')
+    list_filter = ('status', 'event_type')
+
+@admin.register(FeeTier)
+class FeeTierAdmin(admin.ModelAdmin):
+    list_display = ('upper_bound', 'platform_pct', 'gateway_only', 'is_active')
+    list_editable = ('platform_pct', 'gateway_only', 'is_active')
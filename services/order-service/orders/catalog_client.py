@@ -1,31 +1,92 @@
+import os
+import random
+import threading
+import time
 import requests
+from django.conf import settings
+from django.core.cache import cache
 from rest_framework.exceptions import ValidationError
+from shared.http import CircuitBreaker, pooled_session
 
 
 class CatalogClient:
     # URL interna do Docker (nome do serviço no docker-compose)
-    BASE_URL = "http://catalog-service:8000/api/catalog"
+    BASE_URL = os.environ.get('CATALOG_SERVICE_URL', "http://catalog-service:8000/api/catalog")
+
+    TIMEOUT = (1, 3)  # (conexão, leitura) em segundos
+    MAX_RETRIES = 2  # Só para GETs (idempotentes)
+    BACKOFF_BASE = 0.1  # Segundos; dobra a cada tentativa, com jitter
+    POOL_SIZE = 10  # Conexões keep-alive por worker
+
+    breaker = CircuitBreaker()
+    _session = None
+    _session_lock = threading.Lock()
+
+    @classmethod
+    def _get_session(cls):
+        # Criada sob demanda: cada worker (pós-fork do gunicorn/celery) tem seu próprio pool
+        if cls._session is None:
+            with cls._session_lock:
+                if cls._session is None:
+                    cls._session = pooled_session(cls.POOL_SIZE)
+        return cls._session
+
+    @classmethod
+    def _get(cls, path):
+        """
+        GET no Catalog Service com retry (backoff exponencial + jitter) e circuit breaker.
+        Respostas 4xx são devolvidas na hora; erros de rede e 5xx contam como falha.
+        """
+        if not cls.breaker.allow():
+            raise ValidationError("Serviço de Catálogo indisponível no momento.")
+
+        url = f"{cls.BASE_URL}{path}"
+        for attempt in range(cls.MAX_RETRIES + 1):
+            try:
+                response = cls._get_session().get(url, timeout=cls.TIMEOUT)
+                if response.status_code < 500:
+                    cls.breaker.record_success()
+                    return response
+            except requests.exceptions.RequestException:
+                pass
+
+            if attempt < cls.MAX_RETRIES:
+                time.sleep(random.uniform(0, cls.BACKOFF_BASE * (2 ** attempt)))
+
+        # Se o Catalog Service estiver offline
+        cls.breaker.record_failure()
+        raise ValidationError("Serviço de Catálogo indisponível no momento.")
+
+    @staticmethod
+    def _snapshot_key(gig_id):
+        return f"gig_snapshot:{gig_id}"
 
     @classmethod
     def get_gig_details(cls, gig_id):
         """
         Consulta o Catalog Service para pegar detalhes do Gig.
+        Usa o snapshot em cache (Redis) quando existir.
         """
-        try:
-            url = f"{cls.BASE_URL}/gigs/{gig_id}/"
-            response = requests.get(url, timeout=5)
+        gig_data = cache.get(cls._snapshot_key(gig_id))
+        if gig_data is not None:
+            return gig_data
 
-            if response.status_code == 404:
-                raise ValidationError(f"Gig {gig_id} não encontrado no catálogo.")
+        response = cls._get(f"/gigs/{gig_id}/")
 
-            if response.status_code != 200:
-                raise ValidationError("Erro de comunicação com o serviço de catálogo.")
+        if response.status_code == 404:
+            raise ValidationError(f"Gig {gig_id} não encontrado no catálogo.")
 
-            return response.json()
+        if response.status_code != 200:
+            raise ValidationError("Erro de comunicação com o serviço de catálogo.")
 
-        except requests.exceptions.RequestException:
-            # Se o Catalog Service estiver offline
-            raise ValidationError("Serviço de Catálogo indisponível no momento.")
+        gig_data = response.json()
+        cache.set(cls._snapshot_key(gig_id), gig_data, timeout=settings.GIG_SNAPSHOT_CACHE_TTL)
+        return gig_data
+
+    @classmethod
+    def invalidate_gig(cls, gig_id):
+        """Descarta o snapshot de um Gig (chamado pelo evento 'catalog.gig_changed')."""
+        cache.delete(cls._snapshot_key(gig_id))
 
     @classmethod
     def validate_price(cls, gig_data, amount):
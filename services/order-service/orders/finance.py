@@ -1,38 +1,88 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import namedtuple
 from decimal import Decimal, ROUND_HALF_UP
 
+# Faixa da tabela de taxas. upper_bound=None significa "sem limite".
+Tier = namedtuple('Tier', ['upper_bound', 'platform_pct', 'gateway_only'])
+
 
 class FinanceCalculator:
     # Custo fixo do AbacatePay por transação
     GATEWAY_FIXED_FEE = Decimal('0.80')
 
+    # Tabela padrão, usada enquanto não houver faixas ativas cadastradas (FeeTier)
+    DEFAULT_TIERS = (
+        Tier(Decimal('19.99'), Decimal('0.00'), True),  # Proteção (< R$ 20): só repassa o gateway
+        Tier(Decimal('100.00'), Decimal('0.04'), False),  # 4%
+        Tier(Decimal('400.00'), Decimal('0.06'), False),  # 6%
+        Tier(Decimal('700.00'), Decimal('0.08'), False),  # 8%
+        Tier(None, Decimal('0.10'), False),  # 10%
+    )
+
+    # A tabela é carregada uma vez por processo e relida depois deste tempo (ou ao salvar uma FeeTier)
+    TIERS_TTL = 60
+
+    _table = None
+    _loaded_at = 0
+    _lock = threading.Lock()
+
+    @classmethod
+    def invalidate_tiers(cls):
+        cls._table = None
+
+    @classmethod
+    def _get_table(cls):
+        """
+        Retorna (limites, faixas, pcts em pontos-base) prontos para busca binária.
+        """
+        table = cls._table
+        if table is not None and time.monotonic() - cls._loaded_at < cls.TIERS_TTL:
+            return table
+
+        with cls._lock:
+            from .models import FeeTier
+
+            tiers = [
+                Tier(t.upper_bound, t.platform_pct, t.gateway_only)
+                for t in FeeTier.objects.filter(is_active=True)
+            ] or list(cls.DEFAULT_TIERS)
+
+            # Só a primeira faixa sem limite vale (um None entre os limites quebraria o bisect)
+            unlimited = next((t for t in tiers if t.upper_bound is None), None)
+            tiers = [t for t in tiers if t.upper_bound is not None]
+            # Garante uma faixa final sem limite (herda o percentual da última cadastrada)
+            tiers.append(unlimited or tiers[-1]._replace(upper_bound=None))
+
+            bounds = [t.upper_bound for t in tiers[:-1]]
+            basis_points = [int(t.platform_pct * 10000) for t in tiers]
+            cls._table = (bounds, tiers, basis_points)
+            cls._loaded_at = time.monotonic()
+            return cls._table
+
     @classmethod
     def calculate_fees(cls, amount):
         """
         Calcula o split financeiro com proteção contra prejuízo.
         """
-        amount = Decimal(str(amount))
+        if not isinstance(amount, Decimal):
+            amount = Decimal(str(amount))
 
         # Validação de segurança mínima
         if amount < cls.GATEWAY_FIXED_FEE:
             raise ValueError(f"O valor mínimo do pedido deve ser R$ {cls.GATEWAY_FIXED_FEE}")
 
-        # --- REGRA DE PROTEÇÃO (< R$ 20) ---
-        if amount < Decimal('20.00'):
+        bounds, tiers, _ = cls._get_table()
+        tier = tiers[bisect_left(bounds, amount)]
+
+        if tier.gateway_only:
             # Lykos não lucra nada, apenas repassa o custo do gateway
             platform_gross_income = cls.GATEWAY_FIXED_FEE
             platform_pct = Decimal('0.00')
             lykos_real_profit = Decimal('0.00')
-
-        # --- REGRA PADRÃO (>= R$ 20) ---
         else:
-            if amount <= 100:
-                platform_pct = Decimal('0.04')  # 4%
-            elif amount <= 400:
-                platform_pct = Decimal('0.06')  # 6%
-            elif amount <= 700:
-                platform_pct = Decimal('0.08')  # 8%
-            else:
-                platform_pct = Decimal('0.10')  # 10%
+            platform_pct = tier.platform_pct
 
             # Calcula retenção bruta
             platform_gross_income = (amount * platform_pct).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
@@ -50,4 +100,54 @@ class FinanceCalculator:
             "freelancer_net": freelancer_net_income,
             "gateway_cost": cls.GATEWAY_FIXED_FEE,
             "lykos_profit": lykos_real_profit
-        }
\ No newline at end of file
+        }
+
+    @staticmethod
+    def to_cents(amounts):
+        """Converte valores (Decimal/str/float) para centavos inteiros, arredondando meio centavo para cima."""
+        return [
+            int((a if isinstance(a, Decimal) else Decimal(str(a))).scaleb(2).to_integral_value(ROUND_HALF_UP))
+            for a in amounts
+        ]
+
+    @classmethod
+    def calculate_fees_batch(cls, amounts, cents=False):
+        """
+        Versão em lote para fechamentos e relatórios. Recebe uma sequência de valores
+        (ou de centavos inteiros, com cents=True) e devolve colunas, uma lista por chave.
+
+        Todo o cálculo é feito em centavos inteiros: exato (mesmo resultado de calculate_fees)
+        e sem criar um Decimal por item. Os valores monetários saem em centavos ('*_cents').
+        """
+        amount_cents = amounts if cents else cls.to_cents(amounts)
+        bounds, tiers, basis_points = cls._get_table()
+        gateway_cents = int(cls.GATEWAY_FIXED_FEE * 100)
+        bound_cents = [int(b * 100) for b in bounds]
+
+        if amount_cents and min(amount_cents) < gateway_cents:
+            raise ValueError(f"O valor mínimo do pedido deve ser R$ {cls.GATEWAY_FIXED_FEE}")
+
+        # Faixa de cada valor por busca binária nos limites
+        tier_index = [bisect_left(bound_cents, c) for c in amount_cents]
+
+        # Faixa "só gateway" vira pontos-base None; nas outras, round-half-up de centavos * bp / 10000
+        tier_bp = [None if t.gateway_only else bp for t, bp in zip(tiers, basis_points)]
+        fee_cents = [
+            gateway_cents if bp is None else (c * bp + 5000) // 10000
+            for c, bp in zip(amount_cents, (tier_bp[i] for i in tier_index))
+        ]
+
+        zero = Decimal('0.00')
+        tier_pct = [zero if t.gateway_only else t.platform_pct for t in tiers]
+        tier_gateway_only = [t.gateway_only for t in tiers]
+        return {
+            "amount_cents": list(amount_cents),
+            "platform_pct": [tier_pct[i] for i in tier_index],
+            "platform_fee_cents": fee_cents,
+            "freelancer_net_cents": [c - f for c, f in zip(amount_cents, fee_cents)],
+            "gateway_cost_cents": gateway_cents,
+            "lykos_profit_cents": [
+                0 if tier_gateway_only[i] else f - gateway_cents
+                for f, i in zip(fee_cents, tier_index)
+            ],
+        }
@@ -0,0 +1,52 @@
+import random
+import time
+from decimal import Decimal
+from django.core.management.base import BaseCommand
+from orders.finance import FinanceCalculator
+
+
+class Command(BaseCommand):
+    help = 'Compara o cálculo de taxas por chamada (calculate_fees) com o cálculo em lote (calculate_fees_batch)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=1_000_000, help='Quantidade de valores (padrão: 1 milhão)')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        size = options['size']
+        rng = random.Random(options['seed'])
+
+        # Valores em centavos entre R$ 0,80 e R$ 2.000,00, cobrindo todas as faixas
+        amounts = [Decimal(rng.randint(80, 200_000)).scaleb(-2) for _ in range(size)]
+        FinanceCalculator._get_table()  # Carrega a tabela fora da medição
+
+        self.stdout.write(f"Calculando taxas de {size} valores...")
+
+        start = time.perf_counter()
+        per_call = [FinanceCalculator.calculate_fees(a) for a in amounts]
+        per_call_time = time.perf_counter() - start
+
+        # Lote partindo de Decimal (inclui a conversão para centavos)
+        start = time.perf_counter()
+        batch = FinanceCalculator.calculate_fees_batch(amounts)
+        batch_time = time.perf_counter() - start
+
+        # Lote partindo de centavos (ex: fechamento lendo os valores já em centavos)
+        cents = FinanceCalculator.to_cents(amounts)
+        start = time.perf_counter()
+        FinanceCalculator.calculate_fees_batch(cents, cents=True)
+        batch_cents_time = time.perf_counter() - start
+
+        # Os dois caminhos precisam dar exatamente o mesmo resultado
+        for key in ('platform_fee', 'freelancer_net', 'lykos_profit'):
+            if [int(row[key] * 100) for row in per_call] != batch[f'{key}_cents']:
+                self.stderr.write(self.style.ERROR(f"Divergência na coluna '{key}'!"))
+                return
+
+        self.stdout.write(f"Por chamada:        {per_call_time:.2f}s ({size / per_call_time:,.0f} valores/s)")
+        self.stdout.write(f"Lote (Decimal):     {batch_time:.2f}s ({size / batch_time:,.0f} valores/s)")
+        self.stdout.write(f"Lote (centavos):    {batch_cents_time:.2f}s ({size / batch_cents_time:,.0f} valores/s)")
+        self.stdout.write(self.style.SUCCESS(
+            f"Lote {per_call_time / batch_time:.1f}x ({per_call_time / batch_cents_time:.1f}x em centavos) "
+            f"mais rápido, resultados idênticos."
+        ))
@@ -0,0 +1,86 @@
+from decimal import Decimal
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Sum
+from orders.models import Wallet, WalletLedgerEntry
+
+
+class Command(BaseCommand):
+    help = 'Recalcula os saldos das Wallets a partir do livro-razão (WalletLedgerEntry)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Só mostra as divergências, sem corrigir')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        batch_size = options['batch_size']
+        zero = Decimal('0.00')
+
+        aberturas = divergentes = 0
+        last_id = 0
+        while True:
+            # Um lote de wallets por transação, em ordem de id. O lock vem ANTES de somar o livro-razão:
+            # um crédito/liberação concorrente espera o COMMIT do lote (o UPDATE dele bate no lock),
+            # então a soma nunca fica para trás do saldo que vai ser sobrescrito.
+            with transaction.atomic():
+                wallets = list(
+                    Wallet.objects.select_for_update().filter(id__gt=last_id).order_by('id')[:batch_size]
+                )
+                if not wallets:
+                    break
+                last_id = wallets[-1].id
+                ids = [wallet.id for wallet in wallets]
+
+                # 1. Soma o livro-razão das wallets do lote em uma única query agregada
+                totais = {
+                    row['wallet_id']: (row['pending'] or zero, row['available'] or zero)
+                    for row in WalletLedgerEntry.objects.filter(wallet_id__in=ids).values('wallet_id').annotate(
+                        pending=Sum('pending_delta'),
+                        available=Sum('available_delta'),
+                    )
+                }
+
+                # 2. Wallets sem lançamento de abertura recebem a parte do saldo que o livro-razão não explica
+                # (saldo anterior ao livro-razão). Mesmo quando a diferença é zero: a partir da abertura,
+                # qualquer divergência é corrigida em vez de absorvida.
+                com_abertura = set(
+                    WalletLedgerEntry.objects.filter(wallet_id__in=ids, entry_type='OPENING').values_list('wallet_id', flat=True)
+                )
+                novas = []
+                for wallet in wallets:
+                    if wallet.id in com_abertura:
+                        continue
+                    pending, available = totais.get(wallet.id, (zero, zero))
+                    novas.append(WalletLedgerEntry(
+                        wallet=wallet,
+                        entry_type='OPENING',
+                        pending_delta=wallet.pending_balance - pending,
+                        available_delta=wallet.available_balance - available,
+                    ))
+                    totais[wallet.id] = (wallet.pending_balance, wallet.available_balance)
+                if novas and not dry_run:
+                    WalletLedgerEntry.objects.bulk_create(novas)
+                aberturas += len(novas)
+
+                # 3. Compara com os saldos materializados e corrige em lote
+                corrigir = []
+                for wallet in wallets:
+                    pending, available = totais[wallet.id]
+                    if (wallet.pending_balance, wallet.available_balance) != (pending, available):
+                        self.stdout.write(
+                            f"Wallet {wallet.id} (user {wallet.user_id}): "
+                            f"pendente {wallet.pending_balance} -> {pending}, disponível {wallet.available_balance} -> {available}"
+                        )
+                        wallet.pending_balance = pending
+                        wallet.available_balance = available
+                        corrigir.append(wallet)
+
+                if corrigir and not dry_run:
+                    Wallet.objects.bulk_update(corrigir, ['pending_balance', 'available_balance'])
+                divergentes += len(corrigir)
+
+        self.stdout.write(f"{aberturas} lançamentos de abertura {'a criar' if dry_run else 'criados'}.")
+        self.stdout.write(self.style.SUCCESS(
+            f"Reconciliação concluída: {divergentes} wallets divergentes{' (dry-run)' if dry_run else ' corrigidas'}."
+        ))
@@ -1,6 +1,10 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+import logging
 import uuid
 
+logger = logging.getLogger(__name__)
+
 
 class Order(models.Model):
     STATUS_CHOICES = [
@@ -48,6 +52,14 @@ class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        # Índices da paginação por cursor (created_at, id) em cada ramo da listagem
+        indexes = [
+            models.Index(fields=['client_id', 'created_at', 'id'], name='order_client_created_idx'),
+            models.Index(fields=['freelancer_id', 'created_at', 'id'], name='order_freelancer_created_idx'),
+            models.Index(fields=['created_at', 'id'], name='order_created_idx'),
+        ]
+
     def __str__(self):
         return f"Order #{str(self.id)[:8]} - {self.status} (R$ {self.amount})"
 
@@ -74,17 +86,163 @@ class Transaction(models.Model):
     def __str__(self):
         return f"Transação {self.external_id} - {self.status}"
 
+
+class BillingCustomer(models.Model):
+    """
+    Dados do pagador (com o CPF) guardados só até a cobrança ser criada no AbacatePay.
+    Ficam no banco em vez de irem na mensagem do Celery: o CPF nunca passa pelo broker.
+    Apagados quando a cobrança é registrada ou o pedido é cancelado.
+    """
+    order = models.OneToOneField(Order, on_delete=models.CASCADE, primary_key=True, related_name='billing_customer')
+    name = models.CharField(max_length=200)
+    email = models.EmailField()
+    tax_id = models.CharField(max_length=14, help_text="CPF/CNPJ")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def as_customer_data(self):
+        return {'name': self.name, 'email': self.email, 'taxId': self.tax_id}  # Abacate usa taxId
+
+class FeeTier(models.Model):
+    """
+    Faixa da tabela de taxas da plataforma (editável pelo Admin, sem deploy).
+    Vale para pedidos com valor <= upper_bound; a faixa sem limite (null) fecha a tabela.
+    """
+    id = models.BigAutoField(primary_key=True)
+    upper_bound = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, blank=True, unique=True,
+        help_text="Valor máximo do pedido nesta faixa (vazio = sem limite)"
+    )
+    platform_pct = models.DecimalField(
+        max_digits=5, decimal_places=4, default=0,
+        help_text="Percentual retido pela Lykos (Ex: 0.0600 = 6%)"
+    )
+    gateway_only = models.BooleanField(
+        default=False,
+        help_text="Proteção contra prejuízo: retém só o custo do gateway, sem lucro"
+    )
+    is_active = models.BooleanField(default=True)
+
+    class Meta:
+        ordering = [models.F('upper_bound').asc(nulls_last=True)]
+        constraints = [
+            # NULL não conflita no unique de upper_bound: no máximo uma faixa ativa sem limite
+            models.UniqueConstraint(
+                fields=['is_active'],
+                condition=models.Q(upper_bound__isnull=True, is_active=True),
+                name='single_unlimited_fee_tier',
+            ),
+        ]
+
+    def __str__(self):
+        limite = f"até R$ {self.upper_bound}" if self.upper_bound is not None else "acima"
+        return f"{limite}: {'só gateway' if self.gateway_only else f'{self.platform_pct * 100}%'}"
+
+
+class WebhookEvent(models.Model):
+    """
+    Caixa de entrada dos webhooks do AbacatePay.
+    O endpoint só grava o evento cru e responde; as transições de estado são aplicadas
+    em lote por um worker. O event_id único descarta reenvios do gateway.
+    """
+    STATUS_CHOICES = [
+        ('RECEIVED', 'Recebido'),
+        ('PROCESSED', 'Processado'),
+        ('IGNORED', 'Ignorado'),
+    ]
+
+    event_id = models.CharField(max_length=150, unique=True)
+    event_type = models.CharField(max_length=50)
+    payload = models.JSONField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='RECEIVED')
+
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'received_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} {self.event_id} - {self.status}"
+
+
 class Wallet(models.Model):
     user_id = models.IntegerField(unique=True) # ID do usuário do auth-service
     pending_balance = models.DecimalField(max_digits=10, decimal_places=2, default=0) # Bloqueado
     available_balance = models.DecimalField(max_digits=10, decimal_places=2, default=0) # Liberado para saque
 
-    def credit_pending(self, amount):
-        self.pending_balance += amount
-        self.save()
+    # Os saldos são derivados do livro-razão (WalletLedgerEntry). Cada movimento grava um
+    # lançamento e aplica o delta com UPDATE ... SET saldo = saldo + X no banco, sem
+    # ler-somar-salvar em Python: pedidos simultâneos do mesmo vendedor não perdem valores.
+
+    def _apply(self, entry_type, order=None, pending_delta=0, available_delta=0, **conditions):
+        try:
+            with transaction.atomic():
+                updated = Wallet.objects.filter(pk=self.pk, **conditions).update(
+                    pending_balance=F('pending_balance') + pending_delta,
+                    available_balance=F('available_balance') + available_delta,
+                )
+                if not updated:
+                    return False
+
+                WalletLedgerEntry.objects.create(
+                    wallet=self,
+                    order=order,
+                    entry_type=entry_type,
+                    pending_delta=pending_delta,
+                    available_delta=available_delta,
+                )
+        except IntegrityError:
+            # Lançamento deste tipo já existe para o pedido (unique_ledger_entry_per_order):
+            # o movimento já foi aplicado e o savepoint desfaz o UPDATE repetido. No-op idempotente.
+            logger.info(f"{entry_type} do pedido {order.pk if order else None} já aplicado na wallet {self.pk}")
+            return True
+
+        self.refresh_from_db(fields=['pending_balance', 'available_balance'])
+        return True
+
+    def credit_pending(self, amount, order=None):
+        return self._apply('CREDIT_PENDING', order, pending_delta=amount)
+
+    def release_funds(self, amount, order=None):
+        # A condição vai no próprio UPDATE: nunca deixa o saldo pendente negativo
+        return self._apply(
+            'RELEASE', order,
+            pending_delta=-amount, available_delta=amount,
+            pending_balance__gte=amount,
+        )
+
+    def credit_available(self, amount, order=None):
+        """Ajuste manual do sistema: credita direto no saldo disponível."""
+        return self._apply('ADJUSTMENT', order, available_delta=amount)
+
+
+class WalletLedgerEntry(models.Model):
+    ENTRY_TYPES = [
+        ('OPENING', 'Saldo de Abertura'),
+        ('CREDIT_PENDING', 'Crédito Pendente'),
+        ('RELEASE', 'Liberação de Saldo'),
+        ('ADJUSTMENT', 'Ajuste'),
+    ]
+
+    # Append-only: lançamentos nunca são editados, correções entram como novos lançamentos
+    wallet = models.ForeignKey(Wallet, on_delete=models.PROTECT, related_name='entries')
+    order = models.ForeignKey(Order, on_delete=models.SET_NULL, null=True, blank=True, related_name='ledger_entries')
+    entry_type = models.CharField(max_length=20, choices=ENTRY_TYPES)
+    pending_delta = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    available_delta = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            # Um mesmo pedido não credita/libera duas vezes
+            models.UniqueConstraint(
+                fields=['order', 'entry_type'],
+                condition=models.Q(order__isnull=False),
+                name='unique_ledger_entry_per_order',
+            ),
+        ]
 
-    def release_funds(self, amount):
-        if self.pending_balance >= amount:
-            self.pending_balance -= amount
-            self.available_balance += amount
-            self.save()
\ No newline at end of file
+    def __str__(self):
+        return f"{self.entry_type} wallet={self.wallet_id} ({self.pending_delta}/{self.available_delta})"
@@ -0,0 +1,39 @@
+from django.db import connection
+from shared.pagination import KeysetPagination as BaseKeysetPagination
+
+
+class KeysetPagination(BaseKeysetPagination):
+    """
+    Paginação por cursor (keyset) em (created_at, id), do mais novo para o mais antigo:
+    custo constante não importa quantos pedidos o usuário tenha.
+
+    Recebe uma lista de querysets (ramos). Com mais de um ramo, cada um é filtrado e
+    limitado separadamente (cada um vira um index scan) e o resultado é um UNION.
+    """
+    page_size = 20
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
+
+    def paginate_querysets(self, querysets, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        position = self.decode_cursor(request, querysets[0])
+        limit = self.page_size + 1  # Um a mais para saber se existe próxima página
+
+        branches = []
+        for queryset in querysets:
+            if position is not None:
+                queryset = self.filter_after(queryset, position)
+            if len(querysets) == 1:
+                queryset = queryset.order_by(*self.ordering)
+            elif connection.features.supports_slicing_ordering_in_compound:
+                # Postgres: "(... ORDER BY ... LIMIT n) UNION (...)", cada ramo para cedo no índice
+                queryset = queryset.order_by(*self.ordering)[:limit]
+            branches.append(queryset)
+
+        if len(branches) > 1:
+            queryset = branches[0].union(*branches[1:]).order_by(*self.ordering)
+        else:
+            queryset = branches[0]
+
+        return self.set_page(list(queryset[:limit]))
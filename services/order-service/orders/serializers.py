@@ -10,7 +10,9 @@ class TransactionSerializer(serializers.ModelSerializer):
 
 class OrderSerializer(serializers.ModelSerializer):
     # Serializa as transações relacionadas (opcional, mas útil para debug)
-    transactions = TransactionSerializer(source='transaction_set', many=True, read_only=True)
+    transactions = TransactionSerializer(many=True, read_only=True)
+    # Preenchido quando o worker cria a cobrança (null enquanto PENDING)
+    payment_url = serializers.SerializerMethodField()
 
     class Meta:
         model = Order
@@ -41,6 +43,32 @@ class OrderSerializer(serializers.ModelSerializer):
             'created_at'
         ]
 
+    def get_payment_url(self, obj):
+        tx = max(obj.transactions.all(), key=lambda t: t.created_at, default=None)
+        return tx.payment_url if tx else None
+
+
+class OrderListSerializer(serializers.ModelSerializer):
+    """
+    Versão enxuta para listagens: sem transações aninhadas, então a página inteira sai
+    de uma única query, qualquer que seja o tamanho da página.
+    """
+
+    class Meta:
+        model = Order
+        fields = [
+            'id',
+            'client_id',
+            'freelancer_id',
+            'gig_id',
+            'package_title',
+            'amount',
+            'status',
+            'created_at',
+            'updated_at',
+        ]
+        read_only_fields = fields
+
 
 class CreateOrderPayload(serializers.Serializer):
     """
@@ -0,0 +1,10 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .finance import FinanceCalculator
+from .models import FeeTier
+
+
+@receiver([post_save, post_delete], sender=FeeTier)
+def reload_fee_tiers(sender, **kwargs):
+    # Os outros workers pegam a tabela nova quando o TIERS_TTL vencer
+    FinanceCalculator.invalidate_tiers()
@@ -0,0 +1,162 @@
+from celery import shared_task
+from django.db import transaction as db_transaction
+from django.utils import timezone
+from .models import BillingCustomer, Order, Transaction, Wallet, WebhookEvent
+from .abacatepay import AbacatePayService
+from .catalog_client import CatalogClient
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name='orders.create_billing', bind=True, max_retries=5)
+def create_billing_for_order(self, order_id, customer_data=None):
+    """
+    Cria a cobrança no AbacatePay para um pedido já salvo como PENDING.
+    Roda fora da requisição: a latência do gateway não segura worker HTTP nem transação no banco.
+    Os dados do pagador vêm do BillingCustomer do pedido (a mensagem só leva o id);
+    customer_data só é aceito para mensagens publicadas antes dessa mudança.
+    """
+    try:
+        order = Order.objects.get(id=order_id)
+    except Order.DoesNotExist:
+        logger.warning(f"Pedido {order_id} não existe mais. Cobrança ignorada.")
+        return
+
+    if order.status != 'PENDING':
+        return
+
+    # Reentrega da mensagem (ACKS_LATE) ou retry depois que a cobrança já foi registrada:
+    # não chama o gateway de novo, só conclui o que faltou (crédito na wallet)
+    billing = order.transactions.first()
+    if billing is None:
+        if customer_data is None:
+            customer = BillingCustomer.objects.filter(order_id=order.id).first()
+            if customer is None:
+                logger.error(f"Pedido {order_id} sem dados do pagador: cobrança não criada.")
+                return
+            customer_data = customer.as_customer_data()
+
+        service = AbacatePayService()
+        # O gateway não deduplica: se uma tentativa anterior (retry ou reentrega) criou a cobrança e
+        # perdeu a resposta, ela é achada pelo pedido em vez de criada de novo. Ainda há uma janela
+        # pequena (a cobrança criada não aparece na listagem a tempo) em que uma segunda cobrança é possível.
+        may_exist = self.request.retries > 0 or bool((self.request.delivery_info or {}).get('redelivered'))
+        try:
+            billing_data = (may_exist and service.find_billing(order)) or service.create_billing(order, customer_data)
+        except Exception as e:
+            if self.request.retries < self.max_retries:
+                raise self.retry(exc=e, countdown=2 ** self.request.retries)
+            logger.error(f"Cobrança do pedido {order_id} falhou definitivamente: {str(e)}")
+            # Só cancela quando o gateway confirma que não há cobrança para o pedido;
+            # na dúvida o pedido fica PENDING para conferência (o webhook de pagamento ainda chega)
+            try:
+                billing_data = service.find_billing(order)
+            except Exception as e:
+                logger.error(f"Pedido {order_id} mantido PENDING: não foi possível conferir a cobrança no gateway ({str(e)})")
+                return
+            if billing_data is None:
+                Order.objects.filter(id=order_id, status='PENDING').update(status='CANCELLED')
+                BillingCustomer.objects.filter(order_id=order.id).delete()
+                return
+
+        # Grava a cobrança logo após a resposta (e antes de qualquer outra escrita): a partir daqui
+        # um retry nunca cria uma segunda cobrança
+        try:
+            billing, _ = Transaction.objects.get_or_create(
+                external_id=billing_data.get('id'),  # ID do Billing
+                defaults={'order': order, 'payment_url': billing_data.get('url'), 'status': 'PENDING'},
+            )
+        except Exception as e:
+            logger.error(f"Cobrança {billing_data.get('id')} criada mas não registrada para o pedido {order_id}: {str(e)}")
+            raise self.retry(exc=e, countdown=2 ** self.request.retries)
+
+    try:
+        # Cobrança registrada: os dados do pagador (CPF) não são mais necessários
+        BillingCustomer.objects.filter(order_id=order.id).delete()
+
+        # Cria/Atualiza Wallet do Vendedor (Saldo Bloqueado)
+        # O dinheiro "entra" no sistema, mas fica pendente. Idempotente por pedido (livro-razão).
+        with db_transaction.atomic():
+            wallet, _ = Wallet.objects.get_or_create(user_id=order.freelancer_id)
+            wallet.credit_pending(order.freelancer_net, order=order)
+    except Exception as e:
+        raise self.retry(exc=e, countdown=2 ** self.request.retries)
+
+    logger.info(f"Cobrança {billing.external_id} criada para o pedido {order_id}.")
+
+
+@shared_task(name='catalog.gig_changed')
+def invalidate_gig_snapshot(event):
+    """
+    Evento publicado pelo Catalog Service quando preço/status de um Gig (ou dos pacotes) muda.
+    event espera: {'id': int, 'slug': str}
+    """
+    CatalogClient.invalidate_gig(event.get('id'))
+    logger.info(f"Snapshot do Gig {event.get('id')} invalidado.")
+
+
+def webhook_bill_id(payload):
+    """Id da cobrança em payload['data']['id'], ou None se o payload não tiver esse formato."""
+    data = payload.get('data') if isinstance(payload, dict) else None
+    bill_id = data.get('id') if isinstance(data, dict) else None
+    if isinstance(bill_id, (str, int)) and not isinstance(bill_id, bool) and str(bill_id):
+        return str(bill_id)
+    return None
+
+
+@shared_task(name='orders.process_webhook_events')
+def process_webhook_events(batch_size=100):
+    """
+    Aplica em lote os webhooks pendentes da caixa de entrada.
+    skip_locked: vários workers dividem o trabalho sem esperar uns pelos outros nem repetir eventos.
+    Agendada pelo endpoint a cada webhook e, como varredura, pelo beat (WEBHOOK_SWEEP_INTERVAL):
+    eventos cujo .delay() falhou são alcançados pela varredura.
+    """
+    with db_transaction.atomic():
+        events = list(
+            WebhookEvent.objects.select_for_update(skip_locked=True)
+            .filter(status='RECEIVED')
+            .order_by('received_at')[:batch_size]
+        )
+        if not events:
+            return 0
+
+        paid_bill_ids = {
+            webhook_bill_id(event.payload)
+            for event in events if event.event_type == 'billing.paid'
+        }
+        paid_bill_ids.discard(None)
+
+        now = timezone.now()
+        txs = list(
+            Transaction.objects.select_for_update()
+            .filter(external_id__in=paid_bill_ids)
+            .values_list('id', 'external_id', 'order_id')
+        )
+        found_bill_ids = {external_id for _, external_id, _ in txs}
+
+        Transaction.objects.filter(id__in=[tx_id for tx_id, _, _ in txs]).exclude(status='PAID').update(
+            status='PAID', updated_at=now
+        )
+        started = Order.objects.filter(
+            id__in=[order_id for _, _, order_id in txs], status='PENDING'
+        ).update(status='IN_PROGRESS', updated_at=now)
+
+        for event in events:
+            bill_id = webhook_bill_id(event.payload)
+            if event.event_type == 'billing.paid' and bill_id in found_bill_ids:
+                event.status = 'PROCESSED'
+            else:
+                if event.event_type == 'billing.paid':
+                    logger.warning(f"Transação não encontrada para Billing ID: {bill_id}")
+                event.status = 'IGNORED'
+            event.processed_at = now
+        WebhookEvent.objects.bulk_update(events, ['status', 'processed_at'])
+
+    logger.info(f"{len(events)} webhooks processados, {started} pedidos pagos e iniciados.")
+
+    # Ainda há fila (ex: rajada depois de uma queda do gateway): continua em outro lote
+    if len(events) == batch_size:
+        process_webhook_events.delay(batch_size)
+    return len(events)
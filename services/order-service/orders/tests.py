@@ -0,0 +1,83 @@
+from decimal import Decimal
+from io import StringIO
+from types import SimpleNamespace
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+from .models import Order, Transaction, Wallet
+
+
+class OrderQueryBudgetTests(TestCase):
+    """
+    Orçamento de queries: a listagem tem que custar o mesmo número de queries
+    com 1 ou 50 pedidos por página (sem N+1).
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            SimpleNamespace(id=1, pk=1, is_authenticated=True, is_staff=False)
+        )
+
+    def _create_orders(self, count):
+        orders = []
+        for i in range(count):
+            order = Order.objects.create(
+                client_id=1, freelancer_id=2, gig_id=10,
+                package_title=f"Gig {i} (Snapshot)", amount=50,
+            )
+            Transaction.objects.create(
+                order=order, external_id=f"bill_{order.id}", payment_url="https://abacatepay.com/pay/x"
+            )
+            orders.append(order)
+        return orders
+
+    def test_list_queries_do_not_grow_with_page_size(self):
+        self._create_orders(50)
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/orders/?page_size=1')
+        self.assertEqual(len(response.data['results']), 1)
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/orders/?page_size=50')
+        self.assertEqual(len(response.data['results']), 50)
+        self.assertNotIn('transactions', response.data['results'][0])
+
+    def test_detail_prefetches_transactions(self):
+        order = self._create_orders(1)[0]
+
+        # Pedido + prefetch das transações
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/orders/{order.id}/')
+        self.assertEqual(len(response.data['transactions']), 1)
+        self.assertEqual(response.data['payment_url'], "https://abacatepay.com/pay/x")
+
+
+class ReconcileWalletsTests(TestCase):
+    """
+    Abertura do livro-razão: o saldo anterior ao livro-razão vira o lançamento OPENING,
+    mesmo quando a wallet já recebeu lançamentos antes da primeira reconciliação.
+    """
+
+    def test_opening_keeps_balance_from_before_the_ledger(self):
+        wallet = Wallet.objects.create(user_id=2, pending_balance=Decimal('40.00'))
+        wallet.credit_pending(Decimal('10.00'))
+
+        call_command('reconcile_wallets', stdout=StringIO())
+
+        wallet.refresh_from_db()
+        self.assertEqual(wallet.pending_balance, Decimal('50.00'))
+        opening = wallet.entries.get(entry_type='OPENING')
+        self.assertEqual(opening.pending_delta, Decimal('40.00'))
+
+    def test_divergence_after_opening_is_corrected(self):
+        wallet = Wallet.objects.create(user_id=2, pending_balance=Decimal('5.00'))
+        call_command('reconcile_wallets', stdout=StringIO())
+        Wallet.objects.filter(pk=wallet.pk).update(available_balance=Decimal('999.00'))
+
+        call_command('reconcile_wallets', stdout=StringIO())
+
+        wallet.refresh_from_db()
+        self.assertEqual(wallet.available_balance, Decimal('0.00'))
+        self.assertEqual(wallet.entries.filter(entry_type='OPENING').count(), 1)
@@ -7,11 +7,12 @@ from django.db import transaction as db_transaction
 from django.db.models import Q
 from django.utils import timezone
 
-from .models import Order, Transaction, Wallet
-from .serializers import OrderSerializer, CreateOrderPayload
-from .abacatepay import AbacatePayService
+from .models import BillingCustomer, Order, Wallet, WebhookEvent
+from .serializers import OrderSerializer, OrderListSerializer, CreateOrderPayload
 from .catalog_client import CatalogClient
 from .finance import FinanceCalculator
+from .pagination import KeysetPagination
+from .tasks import create_billing_for_order, process_webhook_events, webhook_bill_id
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +20,7 @@ logger = logging.getLogger(__name__)
 class OrderViewSet(viewsets.ModelViewSet):
     serializer_class = OrderSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         """
@@ -27,12 +29,35 @@ class OrderViewSet(viewsets.ModelViewSet):
         - Usuário vê apenas o que comprou (client) ou o que vendeu (freelancer).
         """
         user_id = self.request.user.id
+        queryset = Order.objects.prefetch_related('transactions').order_by('-created_at', '-id')
         if self.request.user.is_staff:
-            return Order.objects.all()
+            return queryset
 
-        return Order.objects.filter(
-            Q(client_id=user_id) | Q(freelancer_id=user_id)
-        ).order_by('-created_at')
+        return queryset.filter(Q(client_id=user_id) | Q(freelancer_id=user_id))
+
+    def get_list_querysets(self):
+        """
+        Ramos da listagem. O OR entre client_id e freelancer_id vira um UNION de dois
+        ramos, cada um servido pelo seu índice composto (client_id/freelancer_id, created_at, id).
+        """
+        user_id = self.request.user.id
+        if self.request.user.is_staff:
+            return [Order.objects.all()]
+
+        return [
+            Order.objects.filter(client_id=user_id),
+            Order.objects.filter(freelancer_id=user_id),
+        ]
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return OrderListSerializer
+        return OrderSerializer
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginator.paginate_querysets(self.get_list_querysets(), request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return self.paginator.get_paginated_response(serializer.data)
 
     def create(self, request, *args, **kwargs):
         """
@@ -63,58 +88,67 @@ class OrderViewSet(viewsets.ModelViewSet):
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        # 4. Criação do Pedido (Banco de Dados + Gateway)
-        try:
-            with db_transaction.atomic():
-                # A. Salva o Pedido
-                # CORREÇÃO: Chaves alinhadas com o novo retorno do FinanceCalculator
-                order = Order.objects.create(
-                    client_id=request.user.id,
-                    freelancer_id=data['freelancer_id'],
-                    gig_id=data['gig_id'],
-                    package_title=f"{gig_data.get('titulo', 'Gig')} (Snapshot)",
-
-                    # Valores Financeiros (Split)
-                    amount=finance['total_amount'],
-                    platform_fee=finance['platform_fee'],
-                    freelancer_net=finance['freelancer_net'],
-                    gateway_fee=finance['gateway_cost'],
-
-                    status='PENDING'
-                )
+        # 4. Criação do Pedido (somente Banco de Dados)
+        # A cobrança no AbacatePay é criada depois, por um worker do Celery,
+        # para a latência do gateway não prender a transação nem o worker HTTP.
+        with db_transaction.atomic():
+            order = Order.objects.create(
+                client_id=request.user.id,
+                freelancer_id=data['freelancer_id'],
+                gig_id=data['gig_id'],
+                package_title=f"{gig_data.get('titulo', 'Gig')} (Snapshot)",
+
+                # Valores Financeiros (Split)
+                amount=finance['amount'],
+                platform_fee=finance['platform_fee'],
+                freelancer_net=finance['freelancer_net'],
+                gateway_fee=finance['gateway_cost'],
+
+                status='PENDING'
+            )
+            # Dados do pagador ficam no banco: a mensagem leva só o id do pedido
+            BillingCustomer.objects.create(
+                order=order,
+                name=data['customer_name'],
+                email=data['customer_email'],
+                tax_id=data['customer_cpf'],
+            )
 
-                # B. Chama o Gateway (AbacatePay)
-                customer_data = {
-                    'name': data['customer_name'],
-                    'email': data['customer_email'],
-                    'taxId': data['customer_cpf']  # Abacate usa taxId
-                }
-
-                abacate = AbacatePayService()
-                billing_data = abacate.create_billing(order, customer_data)
-
-                # C. Registra a Transação
-                Transaction.objects.create(
-                    order=order,
-                    external_id=billing_data.get('id'),  # ID do Billing
-                    payment_url=billing_data.get('url'),
-                    status='PENDING'
-                )
+            # Só publica depois do COMMIT, senão o worker pode não achar o pedido
+            db_transaction.on_commit(
+                lambda: create_billing_for_order.delay(str(order.id)),
+                robust=True
+            )
 
-                # D. Cria/Atualiza Wallet do Vendedor (Saldo Bloqueado)
-                # O dinheiro "entra" no sistema, mas fica pendente
-                wallet, _ = Wallet.objects.get_or_create(user_id=data['freelancer_id'])
-                wallet.credit_pending(finance['freelancer_net'])
+        # 202: o link de pagamento ainda não existe. O cliente consulta GET /orders/{id}/payment/
+        return Response(self.get_serializer(order).data, status=status.HTTP_202_ACCEPTED)
 
-                return Response(self.get_serializer(order).data, status=status.HTTP_201_CREATED)
+    @action(detail=True, methods=['get'], url_path='payment')
+    def payment(self, request, pk=None):
+        """
+        Consulta o andamento da cobrança de um pedido (polling).
+        Enquanto o worker não criou a cobrança, responde 202 com Retry-After.
+        """
+        order = self.get_object()
+        tx = order.transactions.order_by('-created_at').first()
 
-        except Exception as e:
-            logger.error(f"Erro ao processar pedido: {str(e)}")
+        if tx is not None:
+            return Response({
+                "status": "READY",
+                "payment_url": tx.payment_url,
+                "transaction_status": tx.status,
+            })
+
+        if order.status == 'CANCELLED':
             return Response(
-                {"error": "Erro interno ao processar pagamento.", "details": str(e)},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                {"status": "FAILED", "error": "Não foi possível gerar a cobrança deste pedido."},
+                status=status.HTTP_409_CONFLICT
             )
 
+        response = Response({"status": "PENDING", "payment_url": None}, status=status.HTTP_202_ACCEPTED)
+        response['Retry-After'] = '2'
+        return response
+
     @action(detail=True, methods=['post'], url_path='deliver')
     def deliver_order(self, request, pk=None):
         """
@@ -166,14 +200,14 @@ class OrderViewSet(viewsets.ModelViewSet):
             # Libera o saldo na carteira
             try:
                 wallet = Wallet.objects.get(user_id=order.freelancer_id)
-                wallet.release_funds(order.freelancer_net)
+                if not wallet.release_funds(order.freelancer_net, order=order):
+                    logger.warning(f"Saldo pendente insuficiente na wallet {wallet.id} para o pedido {order.id}")
             except Wallet.DoesNotExist:
                 # Caso extremo: Wallet não existe (não deveria acontecer se criado no create)
                 # Recria e força saldo disponível (ajuste manual do sistema)
                 wallet = Wallet.objects.create(user_id=order.freelancer_id)
                 # Como não estava pending (erro), adicionamos direto no available
-                wallet.available_balance += order.freelancer_net
-                wallet.save()
+                wallet.credit_available(order.freelancer_net, order=order)
                 logger.warning(f"Wallet recriada forçadamente para usuário {order.freelancer_id} no pedido {order.id}")
 
         return Response({"status": "COMPLETED", "message": "Pedido concluído! O valor foi liberado para o freelancer."})
@@ -182,31 +216,43 @@ class OrderViewSet(viewsets.ModelViewSet):
     def webhook(self, request):
         """
         Recebe notificações do AbacatePay.
+        Só grava o evento na caixa de entrada e confirma; o processamento é feito em lote pelo worker.
         """
-        event = request.data.get('event')
-        data = request.data.get('data', {})
-        bill_id = data.get('id')
+        payload = request.data
+        if not isinstance(payload, dict):
+            return Response({"error": "Payload inválido."}, status=status.HTTP_400_BAD_REQUEST)
 
-        logger.info(f"Webhook recebido: {event} - ID: {bill_id}")
-
-        if event == 'billing.paid' and bill_id:
-            try:
-                # Busca a transação
-                tx = Transaction.objects.get(external_id=bill_id)
-
-                if tx.status != 'PAID':
-                    with db_transaction.atomic():
-                        tx.status = 'PAID'
-                        tx.save()
+        event = payload.get('event')
+        bill_id = webhook_bill_id(payload)
 
-                        order = tx.order
-                        if order.status == 'PENDING':
-                            order.status = 'IN_PROGRESS'
-                            order.save()
-                            logger.info(f"Pedido {order.id} pago e iniciado.")
+        logger.info(f"Webhook recebido: {event} - ID: {bill_id}")
 
-            except Transaction.DoesNotExist:
-                logger.warning(f"Transação não encontrada para Billing ID: {bill_id}")
-                pass
+        if not event or not isinstance(event, str):
+            return Response({"error": "Evento inválido."}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Chave de deduplicação: id do evento ou, na falta dele, evento + id da cobrança.
+        # Sem nenhum dos dois não há como deduplicar (todos cairiam na mesma chave): recusa.
+        event_id = payload.get('id')
+        if isinstance(event_id, (str, int)) and not isinstance(event_id, bool) and str(event_id):
+            event_id = str(event_id)
+        elif bill_id is not None:
+            event_id = f"{event}:{bill_id}"
+        else:
+            return Response({"error": "Webhook sem id."}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Reenvios do gateway repetem o mesmo id: ON CONFLICT DO NOTHING descarta a duplicata
+        WebhookEvent.objects.bulk_create(
+            [WebhookEvent(
+                event_id=event_id[:150],
+                event_type=event[:50],
+                payload=payload,
+            )],
+            ignore_conflicts=True,
+        )
+        try:
+            process_webhook_events.delay()
+        except Exception as e:
+            # O evento já está salvo: a varredura periódica (beat) o alcança
+            logger.warning(f"Não foi possível agendar o processamento de webhooks: {str(e)}")
 
-        return Response({"received": True})
\ No newline at end of file
+        return Response({"received": True})
@@ -67,6 +67,10 @@ DATABASES['default']['OPTIONS'] = {
     'options': '-c search_path=profile_db'
 }
 
+# Uploads vão direto para arquivo temporário em disco (em blocos), nunca inteiros na memória do worker;
+# o django-storages envia esse arquivo ao MinIO em multipart
+FILE_UPLOAD_HANDLERS = ['django.core.files.uploadhandler.TemporaryFileUploadHandler']
+
 # === CELERY / RABBITMQ ===
 CELERY_BROKER_URL = env('RABBITMQ_URL')
 CELERY_ACCEPT_CONTENT = ['json']
@@ -75,9 +79,36 @@ CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'America/Sao_Paulo'
 CELERY_TASK_ACKS_LATE = True
 
+# === EVENTOS user_created (manage.py consume_user_created) ===
+# Fila dedicada, consumida em lotes (um INSERT por lote); o que não puder ser gravado vai para a DLQ
+USER_CREATED_QUEUE = env('USER_CREATED_QUEUE', default='profile_user_created')
+USER_CREATED_DLQ = env('USER_CREATED_DLQ', default='profile_user_created.dlq')
+USER_CREATED_BATCH_SIZE = env.int('USER_CREATED_BATCH_SIZE', default=200)
+USER_CREATED_FLUSH_INTERVAL = env.float('USER_CREATED_FLUSH_INTERVAL', default=0.5)
+USER_CREATED_MAX_RETRIES = env.int('USER_CREATED_MAX_RETRIES', default=5)
+
+# === AUTENTICAÇÃO (JWT stateless, shared.auth) ===
+SIMPLE_JWT = {
+    'SIGNING_KEY': env('JWT_SECRET', default=SECRET_KEY),  # Tem que ser a MESMA do Auth Service
+    'AUTH_HEADER_TYPES': ('Bearer',),
+}
+# Confia nos headers X-User-* do ForwardAuth do Traefik (só com o serviço fechado atrás do Traefik)
+AUTH_TRUST_GATEWAY_HEADERS = env.bool('AUTH_TRUST_GATEWAY_HEADERS', default=False)
+# Segredo que o Auth Service devolve ao ForwardAuth (X-Gateway-Secret): sem ele os X-User-* são ignorados
+AUTH_GATEWAY_SECRET = env('AUTH_GATEWAY_SECRET', default='')
+# Tokens decodificados ficam em cache por worker (TTL curto e nunca além do 'exp')
+AUTH_TOKEN_CACHE_SIZE = env.int('AUTH_TOKEN_CACHE_SIZE', default=10000)
+AUTH_TOKEN_CACHE_TTL = env.int('AUTH_TOKEN_CACHE_TTL', default=60)
+# Fração das autenticações que geram log de debug (0 = desligado) e intervalo do resumo de métricas
+AUTH_DEBUG_SAMPLE_RATE = env.float('AUTH_DEBUG_SAMPLE_RATE', default=0.0)
+AUTH_METRICS_LOG_INTERVAL = env.int('AUTH_METRICS_LOG_INTERVAL', default=60)
+
 # === SWAGGER ===
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'shared.auth.StatelessJWTAuthentication',
+    ],
 }
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Lykos Profile Service API',
@@ -101,8 +132,20 @@ CACHES = {
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
         }
-    }
+    },
+    # Listas de referência (profiles/reference.py), no mesmo Redis. Só aqui os erros são ignorados:
+    # com o Redis fora do ar elas seguem servidas da cópia em memória
+    "reference": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": env('REDIS_URL', default='redis://redis:6379/1'),
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "IGNORE_EXCEPTIONS": True,
+        }
+    },
 }
+# Erros ignorados pelo cache "reference" ainda aparecem no log
+DJANGO_REDIS_LOG_IGNORED_EXCEPTIONS = True
 
 if os.getenv('USE_S3', 'False') == 'True':
     # Backend de armazenamento
@@ -134,10 +177,21 @@ if os.getenv('USE_S3', 'False') == 'True':
     # Em produção, isso seria 'https://minio.lykos.com.br/bucket-name'
     AWS_S3_CUSTOM_DOMAIN = f"{os.getenv('MINIO_PUBLIC_HOST', 'localhost:9000')}/{AWS_STORAGE_BUCKET_NAME}"
 
+    # Endpoint que o navegador enxerga: as URLs assinadas de upload direto (shared.uploads) apontam para ele
+    AWS_S3_PUBLIC_ENDPOINT_URL = os.getenv(
+        'AWS_S3_PUBLIC_ENDPOINT_URL', f"http://{os.getenv('MINIO_PUBLIC_HOST', 'localhost:9000')}"
+    )
+
 else:
     # Fallback para local (desenvolvimento sem docker ou teste)
     MEDIA_URL = '/media/'
     MEDIA_ROOT = BASE_DIR / 'media'
 
 # Tempo padrão de cache para tabelas estáticas (ex: 24h)
-CACHE_TTL_STATIC_DATA = 60 * 60 * 24
\ No newline at end of file
+CACHE_TTL_STATIC_DATA = 60 * 60 * 24
+# Resultados do autocomplete (?search=) das listas de referência, quando o cliente não manda ?limit=
+REFERENCE_SEARCH_LIMIT = env.int('REFERENCE_SEARCH_LIMIT', default=20)
+# Perfil público agregado (/freelancers/<id>/), renderizado e invalidado a cada escrita no perfil
+PROFILE_CACHE_TTL = env.int('PROFILE_CACHE_TTL', default=60 * 60)
+# Máximo de ids por chamada no lote de cartões (/freelancers/cards/)
+PROFILE_CARDS_MAX_IDS = env.int('PROFILE_CARDS_MAX_IDS', default=50)
@@ -2,4 +2,7 @@ from django.apps import AppConfig
 
 class ProfilesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'profiles'
\ No newline at end of file
+    name = 'profiles'
+
+    def ready(self):
+        import profiles.signals  # noqa
\ No newline at end of file
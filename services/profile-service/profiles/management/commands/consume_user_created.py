@@ -0,0 +1,93 @@
+import logging
+import socket
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from kombu import Connection
+from profiles.user_events import (
+    backoff, create_profiles_with_retry, dead_letter, task_payload, user_created_queue
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Consome os eventos user_created em lotes e cria os perfis com um INSERT por lote'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.USER_CREATED_BATCH_SIZE)
+        parser.add_argument('--flush-interval', type=float, default=settings.USER_CREATED_FLUSH_INTERVAL,
+                            help='Segundos máximos que uma mensagem espera o lote encher')
+        parser.add_argument('--drain', action='store_true', help='Esvazia a fila e sai (ex: depois de uma importação)')
+
+    def handle(self, *args, **options):
+        attempt = 0
+        while True:
+            conn = Connection(settings.CELERY_BROKER_URL)
+            try:
+                with conn:
+                    conn.ensure_connection(max_retries=3)
+                    attempt = 0
+                    self.consume(conn, options)
+                    return
+            except conn.connection_errors as e:
+                # Broker caiu: as mensagens sem ACK voltam para a fila (o consumo é idempotente)
+                logger.error(f"Consumidor user_created sem broker: {str(e)}")
+                time.sleep(backoff(attempt, base=1))
+                attempt += 1
+
+    def consume(self, conn, options):
+        batch_size = options['batch_size']
+        flush_interval = options['flush_interval']
+        messages = []
+
+        def on_message(body, message):
+            messages.append(message)
+
+        producer = conn.Producer()
+        # No RabbitMQ, um único ACK cobre o lote inteiro; os transportes virtuais do kombu
+        # (memory, redis) ignoram multiple e exigem um ACK por mensagem
+        ack_multiple = conn.transport.driver_type == 'amqp'
+        # prefetch = tamanho do lote: o broker entrega o lote inteiro sem esperar um ACK por mensagem
+        with conn.Consumer(user_created_queue(), callbacks=[on_message], accept=['json'],
+                           prefetch_count=batch_size):
+            deadline = None
+            while True:
+                # Sem lote aberto, espera em ciclos de flush_interval; com lote aberto, só até o prazo dele
+                timeout = flush_interval if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    conn.drain_events(timeout=timeout)
+                except socket.timeout:
+                    if not messages and options['drain']:
+                        return
+                if not messages:
+                    continue
+                if deadline is None:
+                    deadline = time.monotonic() + flush_interval
+                if len(messages) < batch_size and time.monotonic() < deadline:
+                    continue
+
+                self.flush(producer, messages, ack_multiple)
+                messages.clear()
+                deadline = None
+
+    def flush(self, producer, messages, ack_multiple):
+        payloads = []
+        for message in messages:
+            try:
+                payloads.append(task_payload(message))
+            except Exception as e:
+                dead_letter(producer, message.body.decode('utf-8', 'replace'), f'mensagem inválida: {e}')
+
+        failed = create_profiles_with_retry(payloads, settings.USER_CREATED_MAX_RETRIES) if payloads else []
+        for payload, reason in failed:
+            dead_letter(producer, payload, reason)
+
+        # ACK só depois do COMMIT e da DLQ
+        if ack_multiple:
+            messages[-1].ack(multiple=True)
+        else:
+            for message in messages:
+                message.ack()
+        created = len(payloads) - len(failed)
+        self.stdout.write(f"{created} perfis processados, {len(messages) - created} na DLQ.")
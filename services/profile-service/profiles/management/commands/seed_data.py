@@ -1,5 +1,5 @@
 from django.core.management.base import BaseCommand
-from django.core.cache import cache
+from profiles import reference
 from profiles.models import Idioma, Habilidade
 
 
@@ -73,8 +73,7 @@ class Command(BaseCommand):
         self.stdout.write(f"Seed concluído: {count_created} novas habilidades inseridas.")
 
         # --- 3. CACHE ---
-        # Cacheia a lista completa para leitura rápida no frontend/backend
-        cache.set('lista_idiomas', list(Idioma.objects.values('id', 'nome', 'iso_codigo')), timeout=None)
-        cache.set('lista_habilidades', list(Habilidade.objects.values_list('nome', flat=True)), timeout=None)
+        # Nova versão das listas de referência: as APIs e o autocomplete remontam na próxima leitura
+        reference.bump_version()
 
         self.stdout.write(self.style.SUCCESS('Dados populados e Cache atualizado!'))
\ No newline at end of file
@@ -28,6 +28,8 @@ class Freelancer(models.Model):
     id = models.BigIntegerField(primary_key=True, editable=False)
     nome_exibicao = models.CharField(max_length=150, blank=True)
     foto_perfil = models.ImageField(upload_to=freelancer_directory_path, blank=True, null=True)
+    # Miniaturas WebP/AVIF geradas pelo worker (shared.images)
+    foto_perfil_variants = models.JSONField(default=dict, blank=True, editable=False)
     bio = models.TextField(blank=True)
     status = models.CharField(max_length=20, choices=StatusPerfil.choices, default=StatusPerfil.ATIVO)
 
@@ -109,6 +111,8 @@ class PortfolioItem(models.Model):
     project = models.ForeignKey(PortfolioProject, on_delete=models.CASCADE, related_name='items')
     arquivo = models.FileField(upload_to=portfolio_directory_path)
     tipo_midia = models.CharField(max_length=20, default='IMAGEM')  # IMAGEM, VIDEO, PDF
+    # Miniaturas WebP/AVIF quando o arquivo é imagem (geradas pelo worker)
+    variants = models.JSONField(default=dict, blank=True, editable=False)
 
     # Campo opcional para ordenar as imagens na galeria
     ordem = models.PositiveIntegerField(default=0)
@@ -0,0 +1,103 @@
+import hashlib
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Prefetch
+from rest_framework.renderers import JSONRenderer
+from shared.enums import StatusPerfil
+from .models import Freelancer, FreelancerIdioma, Habilidade, PortfolioItem, PortfolioProject
+from .serializers import FreelancerCardSerializer, FreelancerProfileSerializer
+
+# Perfil e cartão ficam em cache sob a versão do freelancer: uma escrita publica uma versão nova
+# (invalidate) e as entradas antigas nunca mais são lidas. Uma leitura concorrente que grave dados
+# antigos grava na versão que leu, e não na nova.
+VERSION_KEY = 'profiles:freelancer:version:{}'
+CACHE_KEY = 'profiles:freelancer:{}:{}'
+CARD_CACHE_KEY = 'profiles:card:{}:{}'
+
+
+def profile_queryset():
+    """
+    Perfil com tudo o que a página pública mostra, em número fixo de queries (6):
+    freelancer, habilidades, idiomas (com o Idioma), formações, projetos e itens dos projetos.
+    """
+    return Freelancer.objects.prefetch_related(
+        Prefetch('habilidades', queryset=Habilidade.objects.only('id', 'nome').order_by('nome')),
+        Prefetch('idiomas', queryset=FreelancerIdioma.objects.select_related('idioma')),
+        'formacoes',
+        Prefetch(
+            'portfolio_projects',
+            queryset=PortfolioProject.objects.order_by('-created_at').prefetch_related(
+                Prefetch('items', queryset=PortfolioItem.objects.order_by('ordem', 'id'))
+            ),
+        ),
+    )
+
+
+def versions(freelancer_ids):
+    """{id: versão} dos freelancers, num MGET. Quem ainda não tem versão ganha uma agora."""
+    keys = {VERSION_KEY.format(pk): pk for pk in freelancer_ids}
+    found = cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        # Começa pelo relógio (ms): se a chave sumir do Redis, nunca reaproveita o número de uma versão antiga
+        start = int(time.time() * 1000)
+        for key in missing:
+            cache.add(key, start, timeout=None)
+        found.update(cache.get_many(missing))
+    return {pk: found.get(key) for key, pk in keys.items()}
+
+
+def get_profile(freelancer_id):
+    """
+    Retorna (json_bytes, etag) do perfil público, ou None se não existe/não está ativo.
+    Renderizado uma vez e guardado pronto no Redis até alguma escrita no perfil (signals).
+    A versão é lida antes do banco: se o perfil mudar no meio, o que for gravado aqui já nasce velho.
+    """
+    key = CACHE_KEY.format(freelancer_id, versions([freelancer_id])[freelancer_id])
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    freelancer = profile_queryset().filter(id=freelancer_id, status=StatusPerfil.ATIVO).first()
+    if freelancer is None:
+        return None
+
+    body = JSONRenderer().render(FreelancerProfileSerializer(freelancer).data)
+    etag = f'"{hashlib.sha1(body).hexdigest()}"'
+    cache.set(key, (body, etag), timeout=settings.PROFILE_CACHE_TTL)
+    return body, etag
+
+
+def get_cards(freelancer_ids):
+    """
+    Cartões (id, nome, foto) de vários freelancers: um MGET das versões, um dos cartões e, para os que faltam,
+    uma única query (id__in). Retorna {id: cartão} só dos ativos; inexistentes também ficam
+    em cache (como False) para não voltar ao banco, e o cadastro deles invalida a entrada.
+    """
+    keys = {CARD_CACHE_KEY.format(pk, version): pk for pk, version in versions(freelancer_ids).items()}
+    found = cache.get_many(keys)
+    cards = {keys[key]: card for key, card in found.items()}
+
+    missing = [pk for key, pk in keys.items() if key not in found]
+    if missing:
+        queryset = Freelancer.objects.filter(id__in=missing, status=StatusPerfil.ATIVO).only(
+            'id', 'nome_exibicao', 'foto_perfil', 'foto_perfil_variants'
+        )
+        loaded = {card['id']: card for card in FreelancerCardSerializer(queryset, many=True).data}
+        cards.update((pk, loaded.get(pk, False)) for pk in missing)
+        cache.set_many(
+            {key: cards[pk] for key, pk in keys.items() if key not in found}, timeout=settings.PROFILE_CACHE_TTL
+        )
+
+    return {pk: card for pk, card in cards.items() if card}
+
+
+def invalidate(*freelancer_ids):
+    """Publica uma versão nova do perfil e do cartão de cada freelancer (as entradas antigas expiram sozinhas)."""
+    for pk in set(freelancer_ids):
+        key = VERSION_KEY.format(pk)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, int(time.time() * 1000), timeout=None)
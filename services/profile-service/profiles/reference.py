@@ -0,0 +1,207 @@
+import hashlib
+import json
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.functions import Lower
+from .models import Habilidade, Idioma
+
+# Tabelas de referência (Habilidade e Idioma, seedadas) servidas de um snapshot versionado:
+# o Redis guarda a versão atual e o snapshot de cada versão; cada processo mantém a sua cópia
+# montada (mapas nome -> id, JSON pronto e índice de prefixos) enquanto a versão não mudar.
+VERSION_KEY = 'profiles:reference:version'
+
+
+def _cache():
+    # Alias próprio (settings.CACHES): erros do Redis são ignorados só para estas listas
+    return caches['reference']
+
+
+def fold(text):
+    """Minúsculo e sem acentos, para busca: 'Tradução' -> 'traducao'."""
+    return ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c)).lower()
+
+
+class PrefixIndex:
+    """
+    Índice de prefixos do autocomplete (array ordenado + bisect), sem acentos nem caixa.
+    Cada palavra do nome também é um ponto de entrada: 'graf' encontra 'Design Gráfico'.
+    """
+
+    def __init__(self, items):
+        entries = []
+        for item in items:
+            words = fold(item['nome']).split()
+            for start in range(len(words)):
+                entries.append((' '.join(words[start:]), start, item['id']))
+        entries.sort()
+        self.keys = [key for key, _, _ in entries]
+        self.entries = entries
+        self.items = {item['id']: item for item in items}
+        self.sort_keys = {item['id']: fold(item['nome']) for item in items}
+
+    def search(self, query, limit=None):
+        query = ' '.join(fold(query).split())
+        if not query:
+            return []
+
+        # Melhor posição de cada item (0 = o nome começa com o termo), e a ordem alfabética desempata
+        matches = {}
+        for i in range(bisect_left(self.keys, query), len(self.keys)):
+            key, start, pk = self.entries[i]
+            if not key.startswith(query):
+                break
+            matches[pk] = min(start, matches.get(pk, start))
+
+        ranked = sorted(matches, key=lambda pk: (matches[pk], self.sort_keys[pk]))
+        return [self.items[pk] for pk in ranked[:limit]]
+
+
+class Snapshot:
+    """Cópia em memória de uma versão das tabelas de referência."""
+
+    def __init__(self, version, habilidades, idiomas):
+        self.version = version
+        self.lists = {'habilidades': habilidades, 'idiomas': idiomas}
+        self.by_id = {name: {item['id']: item for item in items} for name, items in self.lists.items()}
+
+        # Nome minúsculo -> id (idiomas também pelo código ISO), usados no cadastro do freelancer
+        self.habilidade_ids = {h['nome'].lower(): h['id'] for h in habilidades}
+        self.idioma_ids = {i['iso_codigo'].lower(): i['id'] for i in idiomas}
+        self.idioma_ids.update((i['nome'].lower(), i['id']) for i in idiomas)
+
+        self.skill_index = PrefixIndex(habilidades)
+        self.payloads = {}
+        for name, items in self.lists.items():
+            body = json.dumps(items, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            self.payloads[name] = (body, f'"{hashlib.sha1(body).hexdigest()}"')
+
+    def search(self, name, query, limit=None):
+        if name == 'habilidades':
+            return self.skill_index.search(query, limit)
+        # Idiomas são poucos: busca linear por nome ou código ISO
+        query = fold(query.strip())
+        return [i for i in self.lists[name] if query in fold(i['nome']) or query in fold(i['iso_codigo'])][:limit]
+
+
+def load():
+    """Lê as duas tabelas do banco (2 queries), já ordenadas por nome e no formato dos serializers."""
+    return {
+        'habilidades': list(Habilidade.objects.order_by('nome').values('id', 'nome')),
+        'idiomas': list(Idioma.objects.order_by('nome').values('id', 'nome', 'iso_codigo')),
+    }
+
+
+def current_version():
+    version = _cache().get(VERSION_KEY)
+    if version is None:
+        # Começa pelo relógio (ms): se a chave sumir do Redis, nunca reaproveita o número de uma versão antiga
+        _cache().add(VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = _cache().get(VERSION_KEY)
+    return version
+
+
+def bump_version():
+    """Publica uma nova versão: todos os processos remontam o snapshot na próxima leitura."""
+    try:
+        _cache().incr(VERSION_KEY)
+    except ValueError:
+        _cache().add(VERSION_KEY, int(time.time() * 1000), timeout=None)
+
+
+def invalidate():
+    # Depois do COMMIT: senão outro processo pode remontar a nova versão ainda com os dados antigos
+    transaction.on_commit(bump_version)
+
+
+_local = None
+_lock = threading.Lock()
+
+
+def snapshot():
+    """
+    Snapshot da versão atual. O caso comum custa um GET no Redis (a versão); o banco só é lido
+    quando a versão muda e ninguém ainda gravou o snapshot dela no Redis.
+    Com o Redis fora do ar (versão None), segue servindo a cópia local.
+    """
+    global _local
+    version = current_version()
+    local = _local
+    if local is not None and (version is None or local.version == version):
+        return local
+
+    with _lock:
+        if _local is not None and _local.version == version:
+            return _local
+
+        data_key = f'profiles:reference:v{version}'
+        data = _cache().get(data_key) if version is not None else None
+        if data is None:
+            data = load()
+            if version is not None:
+                _cache().set(data_key, data, timeout=settings.CACHE_TTL_STATIC_DATA)
+
+        _local = Snapshot(version, **data)
+        return _local
+
+
+def _unique(names):
+    """Nomes sem espaços extras e sem repetição (ignorando caixa), na ordem recebida: minúsculo -> original."""
+    unique = {}
+    for name in names:
+        name = (name or '').strip()
+        if name:
+            unique.setdefault(name.lower(), name)
+    return unique
+
+
+def resolve_habilidades(names):
+    """
+    Ids das habilidades pelos nomes (sem diferenciar maiúsculas). As que não existem são criadas
+    num único INSERT; o caso comum (só habilidades do seed) não toca no banco.
+    """
+    mapping = snapshot().habilidade_ids
+    wanted = _unique(names)
+    missing = [key for key in wanted if key not in mapping]
+    if missing:
+        # Capitalize para padronizar (Python vs python)
+        Habilidade.objects.bulk_create(
+            [Habilidade(nome=wanted[key].capitalize()) for key in missing],
+            ignore_conflicts=True,
+        )
+        # ignore_conflicts não devolve os ids: busca só as que faltavam (inclusive criadas por outro processo).
+        # Não entram no snapshot: se a transação desfizer o INSERT, o mapa não fica com ids inexistentes.
+        mapping = {**mapping, **dict(
+            Habilidade.objects.annotate(nome_lower=Lower('nome'))
+            .filter(nome_lower__in=missing).values_list('nome_lower', 'id')
+        )}
+        # bulk_create não dispara signals: a nova versão (com o autocomplete) é publicada aqui
+        invalidate()
+    return [mapping[key] for key in wanted if key in mapping]
+
+
+def resolve_idiomas(names):
+    """
+    Mapa nome minúsculo -> id dos idiomas (pelo nome ou código ISO). Idiomas novos são criados
+    num único INSERT. Retorna (mapa, nomes não resolvidos): o código ISO gerado para um idioma novo
+    (duas primeiras letras) pode colidir com um existente.
+    """
+    mapping = snapshot().idioma_ids
+    wanted = _unique(names)
+    missing = [key for key in wanted if key not in mapping]
+    if missing:
+        Idioma.objects.bulk_create(
+            [Idioma(nome=wanted[key], iso_codigo=wanted[key][:2].upper()) for key in missing],
+            ignore_conflicts=True,
+        )
+        mapping = {**mapping, **dict(
+            Idioma.objects.annotate(nome_lower=Lower('nome'))
+            .filter(nome_lower__in=missing).values_list('nome_lower', 'id')
+        )}
+        invalidate()
+    resolved = {key: mapping[key] for key in wanted if key in mapping}
+    return resolved, [wanted[key] for key in wanted if key not in resolved]
@@ -10,7 +10,20 @@ from .models import (
     PortfolioProject,
     PortfolioItem
 )
+from .reference import resolve_habilidades, resolve_idiomas
 from shared.enums import NivelIdioma
+from shared.images import ImageVariantsField
+from shared.uploads import IMAGE_TYPES, validate_uploaded_key
+
+# Upload direto (URL assinada): tipo -> (prefixo no bucket, Content-Types aceitos)
+UPLOAD_KINDS = {
+    'foto_perfil': ('freelancers/user_{user_id}/uploads', IMAGE_TYPES),
+    'portfolio': ('portfolios/user_{user_id}/uploads', ('image/', 'video/', 'application/pdf')),
+}
+
+
+def upload_prefix(kind, user_id):
+    return UPLOAD_KINDS[kind][0].format(user_id=user_id)
 
 
 # === Serializers Auxiliares (Leitura) ===
@@ -39,7 +52,9 @@ class TornarSeFreelancerSerializer(serializers.ModelSerializer):
     # Mapeamento dos campos do frontend para o model
     nome = serializers.CharField(source='nome_exibicao')
     descricao = serializers.CharField(source='bio')
-    fotoPerfil = serializers.ImageField(source='foto_perfil')
+    fotoPerfil = serializers.ImageField(source='foto_perfil', required=False)
+    # Alternativa ao multipart: chave da foto já enviada direto ao MinIO (/uploads/)
+    fotoPerfilKey = serializers.CharField(write_only=True, required=False, max_length=100)
 
     # Campos que recebem dados brutos (Strings ou Listas) do FormData
     skills = serializers.ListField(child=serializers.CharField(), write_only=True)
@@ -48,7 +63,18 @@ class TornarSeFreelancerSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Freelancer
-        fields = ['nome', 'descricao', 'fotoPerfil', 'skills', 'idiomas', 'formacoes']
+        fields = ['nome', 'descricao', 'fotoPerfil', 'fotoPerfilKey', 'skills', 'idiomas', 'formacoes']
+
+    def validate_fotoPerfilKey(self, value):
+        return validate_uploaded_key(value, upload_prefix('foto_perfil', self.context['request'].user.id))
+
+    def validate(self, attrs):
+        key = attrs.pop('fotoPerfilKey', None)
+        if key:
+            attrs['foto_perfil'] = key
+        if not attrs.get('foto_perfil'):
+            raise serializers.ValidationError({'fotoPerfil': 'Envie a foto de perfil (arquivo ou fotoPerfilKey).'})
+        return attrs
 
     def to_internal_value(self, data):
         """
@@ -95,6 +121,22 @@ class TornarSeFreelancerSerializer(serializers.ModelSerializer):
         formacoes_data = validated_data.pop('formacoes', [])
 
         with transaction.atomic():
+            # Nomes -> ids antes de qualquer escrita: um idioma inválido recusa o cadastro sem ter gravado nada.
+            # Ids de habilidades/idiomas criados aqui ficam só nesta chamada (nunca no mapa em memória de
+            # reference.py): se a transação for desfeita, nenhum processo fica com ids inexistentes.
+            skill_ids = resolve_habilidades(skills_names) if skills_names else []
+            niveis = {}
+            if idiomas_data:
+                idioma_ids, unknown = resolve_idiomas(item.get('nome') for item in idiomas_data)
+                if unknown:
+                    raise serializers.ValidationError({'idiomas': [f"Idioma inválido: {', '.join(unknown)}."]})
+
+                # Mesmo idioma repetido: vale o último nível informado
+                for item in idiomas_data:
+                    nome_idioma = (item.get('nome') or '').strip()
+                    if nome_idioma:
+                        niveis[idioma_ids[nome_idioma.lower()]] = item.get('nivel', 'BASICO')  # Valor padrão se não vier
+
             # 1. Cria ou Atualiza o Freelancer
             freelancer, created = Freelancer.objects.update_or_create(
                 id=user_id,
@@ -105,47 +147,37 @@ class TornarSeFreelancerSerializer(serializers.ModelSerializer):
                 }
             )
 
+            # Cada relação é regravada com um DELETE e um único INSERT em lote.
+
             # 2. Habilidades (Many-to-Many)
             if skills_names:
-                freelancer.habilidades.clear()
-                for name in skills_names:
-                    # Capitalize para padronizar (Python vs python)
-                    skill_obj, _ = Habilidade.objects.get_or_create(nome=name.capitalize())
-                    freelancer.habilidades.add(skill_obj)
+                Through = Habilidade.freelancers.through
+                Through.objects.filter(freelancer_id=freelancer.id).delete()
+                Through.objects.bulk_create([
+                    Through(freelancer_id=freelancer.id, habilidade_id=skill_id)
+                    for skill_id in skill_ids
+                ])
 
             # 3. Idiomas (Tabela Intermediária com Nível)
             if idiomas_data:
                 FreelancerIdioma.objects.filter(freelancer=freelancer).delete()
-                for item in idiomas_data:
-                    nome_idioma = item.get('nome')
-                    nivel = item.get('nivel', 'BASICO')  # Valor padrão se não vier
-
-                    if nome_idioma:
-                        # Tenta encontrar ou cria o idioma base
-                        idioma_obj, _ = Idioma.objects.get_or_create(
-                            nome__iexact=nome_idioma,
-                            defaults={
-                                'nome': nome_idioma,
-                                'iso_codigo': nome_idioma[:2].upper()
-                            }
-                        )
-                        # Cria a relação com nível
-                        FreelancerIdioma.objects.create(
-                            freelancer=freelancer,
-                            idioma=idioma_obj,
-                            nivel=nivel
-                        )
+                FreelancerIdioma.objects.bulk_create([
+                    FreelancerIdioma(freelancer=freelancer, idioma_id=idioma_id, nivel=nivel)
+                    for idioma_id, nivel in niveis.items()
+                ])
 
             # 4. Formações (One-to-Many)
             if formacoes_data:
                 freelancer.formacoes.all().delete()
-                for form in formacoes_data:
-                    Formacao.objects.create(
+                Formacao.objects.bulk_create([
+                    Formacao(
                         freelancer=freelancer,
                         titulo=form.get('titulo'),
                         instituicao=form.get('instituicao'),
                         ano_conclusao=form.get('ano')
                     )
+                    for form in formacoes_data
+                ])
 
         return freelancer
 
@@ -155,13 +187,83 @@ class TornarSeFreelancerSerializer(serializers.ModelSerializer):
 class FreelancerSerializer(serializers.ModelSerializer):
     skills = serializers.StringRelatedField(many=True, source='habilidades')
     formacoes = FormacaoSerializer(many=True)
+    foto_perfil_variants = ImageVariantsField('foto_perfil')
 
     class Meta:
         model = Freelancer
         fields = '__all__'
 
 
+# === Perfil Público Agregado (Leitura) ===
+
+class FreelancerIdiomaSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(source='idioma.id')
+    nome = serializers.CharField(source='idioma.nome')
+    iso_codigo = serializers.CharField(source='idioma.iso_codigo')
+
+    class Meta:
+        model = FreelancerIdioma
+        fields = ['id', 'nome', 'iso_codigo', 'nivel']
+
+
+class PortfolioItemPublicSerializer(serializers.ModelSerializer):
+    variants = ImageVariantsField('arquivo')
+
+    class Meta:
+        model = PortfolioItem
+        fields = ['id', 'arquivo', 'tipo_midia', 'variants', 'ordem']
+
+
+class PortfolioProjectSerializer(serializers.ModelSerializer):
+    items = PortfolioItemPublicSerializer(many=True)
+
+    class Meta:
+        model = PortfolioProject
+        fields = ['id', 'titulo', 'descricao', 'url_externa', 'items']
+
+
+class FreelancerProfileSerializer(serializers.ModelSerializer):
+    """Perfil público: sem dados bancários. Espera o queryset de public_profile (tudo prefetchado)."""
+    skills = serializers.StringRelatedField(many=True, source='habilidades')
+    idiomas = FreelancerIdiomaSerializer(many=True)
+    formacoes = FormacaoSerializer(many=True)
+    portfolio = PortfolioProjectSerializer(many=True, source='portfolio_projects')
+    foto_perfil_variants = ImageVariantsField('foto_perfil')
+
+    class Meta:
+        model = Freelancer
+        fields = [
+            'id', 'nome_exibicao', 'bio', 'foto_perfil', 'foto_perfil_variants', 'status',
+            'skills', 'idiomas', 'formacoes', 'portfolio', 'created_at'
+        ]
+
+
+class FreelancerCardSerializer(serializers.ModelSerializer):
+    """Cartão compacto do vendedor (listagens do catálogo)."""
+    foto_perfil_variants = ImageVariantsField('foto_perfil')
+
+    class Meta:
+        model = Freelancer
+        fields = ['id', 'nome_exibicao', 'foto_perfil', 'foto_perfil_variants']
+
+
 class PortfolioItemSerializer(serializers.ModelSerializer):
+    arquivo = serializers.FileField(required=False)
+    variants = ImageVariantsField('arquivo')
+    # Alternativa ao multipart: chave do arquivo já enviado direto ao MinIO (/uploads/)
+    arquivo_key = serializers.CharField(write_only=True, required=False, max_length=100)
+
     class Meta:
         model = PortfolioItem
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+
+    def validate_arquivo_key(self, value):
+        return validate_uploaded_key(value, upload_prefix('portfolio', self.context['request'].user.id))
+
+    def validate(self, attrs):
+        key = attrs.pop('arquivo_key', None)
+        if key:
+            attrs['arquivo'] = key
+        if self.instance is None and not attrs.get('arquivo'):
+            raise serializers.ValidationError({'arquivo': 'Envie o arquivo (multipart ou arquivo_key).'})
+        return attrs
\ No newline at end of file
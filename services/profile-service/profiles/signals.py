@@ -0,0 +1,89 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from shared.images import needs_variants
+from . import public_profile, reference
+from .models import (
+    Formacao, Freelancer, FreelancerIdioma, Habilidade, Idioma, PortfolioItem, PortfolioProject
+)
+
+
+@receiver(post_save, sender=Freelancer)
+def schedule_foto_variants(sender, instance, raw=False, **kwargs):
+    # Foto nova: as miniaturas são geradas pelo worker, depois do COMMIT
+    if not raw and needs_variants(instance.foto_perfil, instance.foto_perfil_variants):
+        from .tasks import process_foto_perfil
+        transaction.on_commit(lambda: process_foto_perfil.delay(instance.id))
+
+
+@receiver(post_save, sender=PortfolioItem)
+def schedule_portfolio_variants(sender, instance, raw=False, **kwargs):
+    if not raw and instance.tipo_midia == 'IMAGEM' and needs_variants(instance.arquivo, instance.variants):
+        from .tasks import process_portfolio_item
+        transaction.on_commit(lambda: process_portfolio_item.delay(instance.id))
+
+
+@receiver([post_save, post_delete], sender=Habilidade)
+@receiver([post_save, post_delete], sender=Idioma)
+def invalidate_reference(sender, **kwargs):
+    # Edição pelo admin/seed: nova versão das listas, do autocomplete e dos mapas nome -> id
+    reference.invalidate()
+
+
+# --- Perfil público em cache (public_profile): qualquer escrita no perfil descarta o JSON pronto ---
+
+def invalidate_profile(*freelancer_ids):
+    # Depois do COMMIT: senão uma leitura concorrente pode recolocar no cache o perfil antigo
+    transaction.on_commit(lambda: public_profile.invalidate(*freelancer_ids))
+
+
+@receiver([post_save, post_delete], sender=Freelancer)
+def invalidate_freelancer(sender, instance, **kwargs):
+    # Cobre também o cadastro (TornarSeFreelancer): as relações vão em lote, na mesma transação
+    invalidate_profile(instance.id)
+
+
+@receiver([post_save, post_delete], sender=FreelancerIdioma)
+@receiver([post_save, post_delete], sender=Formacao)
+@receiver([post_save, post_delete], sender=PortfolioProject)
+def invalidate_profile_child(sender, instance, **kwargs):
+    invalidate_profile(instance.freelancer_id)
+
+
+@receiver([post_save, post_delete], sender=PortfolioItem)
+def invalidate_portfolio_item(sender, instance, **kwargs):
+    invalidate_profile(instance.project.freelancer_id)
+
+
+@receiver(m2m_changed, sender=Habilidade.freelancers.through)
+def invalidate_skills(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if isinstance(instance, Freelancer):
+        invalidate_profile(instance.id)
+    elif pk_set:
+        invalidate_profile(*pk_set)
+
+
+@receiver(post_save, sender=Habilidade)
+def invalidate_skill_rename(sender, instance, created, **kwargs):
+    if not created:
+        invalidate_profile(*instance.freelancers.values_list('id', flat=True))
+
+
+@receiver(post_save, sender=Idioma)
+def invalidate_language_rename(sender, instance, created, **kwargs):
+    if not created:
+        invalidate_profile(*FreelancerIdioma.objects.filter(idioma=instance).values_list('freelancer_id', flat=True))
+
+
+@receiver(pre_delete, sender=Habilidade)
+def invalidate_skill_delete(sender, instance, **kwargs):
+    # As linhas da tabela M2M somem junto (sem m2m_changed): os freelancers são lidos antes do DELETE
+    invalidate_profile(*instance.freelancers.values_list('id', flat=True))
+
+
+@receiver(pre_delete, sender=Idioma)
+def invalidate_language_delete(sender, instance, **kwargs):
+    # Hoje o PROTECT impede apagar um idioma em uso; se deixar de impedir, os perfis continuam certos
+    invalidate_profile(*FreelancerIdioma.objects.filter(idioma=instance).values_list('freelancer_id', flat=True))
@@ -1,38 +1,66 @@
-from celery import shared_task
+from celery import current_app, shared_task
+from django.conf import settings
 from django.db import transaction
-from .models import Freelancer
+from shared.images import process_image_field
+from . import public_profile, user_events
+from .models import Freelancer, PortfolioItem
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-@shared_task(name='user_created')
-def create_profile_for_new_user(user_data):
+@shared_task(name='user_created', bind=True, max_retries=settings.USER_CREATED_MAX_RETRIES)
+def create_profile_for_new_user(self, user_data):
     """
-    Cria um perfil de Freelancer automaticamente quando um usuário é criado no Auth Service.
-    user_data espera: {'id': int, 'email': str, 'nome': str, 'tipo': str}
+    Cria o perfil base de um freelancer novo do Auth Service, uma mensagem por vez.
+    O caminho principal é o consumidor em lote (manage.py consume_user_created); esta task atende
+    as mensagens publicadas na fila padrão antes dele. Idempotente (ON CONFLICT DO NOTHING).
+    user_data espera: {'id': int, 'email': str, 'nome_usuario': str, 'tipo': str}
     """
-    user_id = user_data.get('id')
-    tipo_usuario = user_data.get('tipo')
+    try:
+        user_events.create_profiles([user_data])
+    except user_events.TRANSIENT_ERRORS as e:
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e, countdown=user_events.backoff(self.request.retries))
+        reason = f'transitório: {e}'
+    except Exception as e:
+        reason = str(e)
+    else:
+        return
 
-    logger.info(f"Recebida mensagem para criar perfil: ID {user_id} ({tipo_usuario})")
+    # Sem conserto com retry: vai para a DLQ em vez de sumir num log
+    with current_app.producer_pool.acquire(block=True) as producer:
+        user_events.dead_letter(producer, user_data, reason)
 
-    # Regra de Negócio: Só criamos perfil para Freelancers?
-    # Ou todo mundo tem perfil? No seu diagrama, Cliente e Freelancer são atores distintos,
-    # mas o 'Usuario' é comum. Vamos assumir que todos têm um registro base aqui
-    # ou filtrar se for apenas FREELANCER.
 
-    # Exemplo: Criar para todos para manter consistência, mas campos ficam vazios
+@shared_task(name='profiles.process_foto_perfil', bind=True, max_retries=3)
+def process_foto_perfil(self, freelancer_id):
+    """Gera as variantes WebP/AVIF da foto de perfil. Idempotente: foto já processada é ignorada."""
+    freelancer = Freelancer.objects.filter(id=freelancer_id).only('id', 'foto_perfil', 'foto_perfil_variants').first()
+    if freelancer is None:
+        return
+
     try:
-        if not Freelancer.objects.filter(id=user_id).exists():
-            Freelancer.objects.create(
-                id=user_id,
-                titulo_profissional="Iniciante" if tipo_usuario == 'FREELANCER' else "Cliente"
-            )
-            logger.info(f"Perfil criado com sucesso para o usuário {user_id}")
-        else:
-            logger.warning(f"Perfil já existe para usuário {user_id}")
+        # Grava por UPDATE (sem signals): o perfil em cache é descartado aqui
+        if process_image_field(freelancer, 'foto_perfil', 'foto_perfil_variants') is not None:
+            public_profile.invalidate(freelancer_id)
+    except Exception as e:
+        logger.error(f"Erro ao gerar variantes da foto do freelancer {freelancer_id}: {str(e)}")
+        raise self.retry(exc=e, countdown=2 ** self.request.retries)
 
+
+@shared_task(name='profiles.process_portfolio_item', bind=True, max_retries=3)
+def process_portfolio_item(self, item_id):
+    """Gera as variantes WebP/AVIF de um item de portfólio do tipo imagem."""
+    item = PortfolioItem.objects.filter(id=item_id).select_related('project').only(
+        'id', 'arquivo', 'variants', 'project__freelancer_id'
+    ).first()
+    if item is None:
+        return
+
+    try:
+        if process_image_field(item, 'arquivo', 'variants') is not None:
+            public_profile.invalidate(item.project.freelancer_id)
     except Exception as e:
-        logger.error(f"Erro ao criar perfil para usuário {user_id}: {str(e)}")
-        # Em tarefas reais, poderíamos dar 'raise e' para o Celery tentar de novo (retry)
\ No newline at end of file
+        logger.error(f"Erro ao gerar variantes do item de portfólio {item_id}: {str(e)}")
+        raise self.retry(exc=e, countdown=2 ** self.request.retries)
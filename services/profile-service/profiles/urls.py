@@ -4,8 +4,11 @@ from .views import (
     TornarSeFreelancerView,
     PortfolioViewSet,
     FreelancerMeView,
+    FreelancerProfileView,
+    FreelancerCardsView,
     IdiomaViewSet,
-    HabilidadeViewSet
+    HabilidadeViewSet,
+    UploadRequestView
 )
 
 # Roteador para ViewSets (CRUDs automáticos)
@@ -18,6 +21,9 @@ urlpatterns = [
     # Rotas de APIViews (Manuais)
     path('become-freelancer/', TornarSeFreelancerView.as_view(), name='become-freelancer'),
     path('me/', FreelancerMeView.as_view(), name='freelancer-me'),
+    path('freelancers/cards/', FreelancerCardsView.as_view(), name='freelancer-cards'),
+    path('freelancers/<int:pk>/', FreelancerProfileView.as_view(), name='freelancer-profile'),
+    path('uploads/<str:kind>/', UploadRequestView.as_view(), name='upload-request'),
 
     # Rotas do Router (tem que vir por último para não engolir as outras)
     path('', include(router.urls)),
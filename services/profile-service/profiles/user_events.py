@@ -0,0 +1,100 @@
+import logging
+import random
+import time
+from django.conf import settings
+from django.db import InterfaceError, OperationalError, connection
+from django.utils import timezone
+from kombu import Queue
+from shared.enums import TipoUsuario
+from . import public_profile
+from .models import Freelancer
+
+logger = logging.getLogger(__name__)
+
+# Erros que passam sozinhos (banco reiniciando, conexão caída, deadlock): vale tentar de novo
+TRANSIENT_ERRORS = (OperationalError, InterfaceError)
+
+
+def user_created_queue():
+    return Queue(settings.USER_CREATED_QUEUE, durable=True)
+
+
+def dead_letter_queue():
+    return Queue(settings.USER_CREATED_DLQ, durable=True)
+
+
+def backoff(attempt, base=0.5, cap=30):
+    """Espera (s) antes da tentativa `attempt` + 1: exponencial com jitter, limitada a `cap`."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def create_profiles(payloads):
+    """
+    Cria os perfis base dos usuários novos num único INSERT ... ON CONFLICT DO NOTHING.
+    Idempotente: mensagens repetidas (redelivery com ACKS_LATE, relay do outbox) não duplicam nem falham.
+    Só freelancers ganham perfil (público): clientes são ignorados e, se um dia virarem freelancer,
+    o perfil é criado pelo become-freelancer.
+    payload: {'id': int, 'email': str, 'nome_usuario': str, 'tipo': str}
+    """
+    profiles = {}
+    for payload in payloads:
+        if payload.get('tipo') != TipoUsuario.FREELANCER:
+            continue
+        user_id = int(payload['id'])
+        profiles[user_id] = Freelancer(id=user_id, nome_exibicao=(payload.get('nome_usuario') or '')[:150])
+
+    if not profiles:
+        return 0
+    Freelancer.objects.bulk_create(profiles.values(), ignore_conflicts=True)
+    # bulk_create não dispara signals: descarta cartões "inexistente" que já estejam em cache
+    public_profile.invalidate(*profiles)
+    return len(profiles)
+
+
+def create_profiles_with_retry(payloads, max_retries):
+    """
+    create_profiles com retry (backoff exponencial) para erros transitórios do banco.
+    Retorna a lista de (payload, motivo) que não puderam ser gravados e vão para a DLQ.
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            create_profiles(payloads)
+            return []
+        except TRANSIENT_ERRORS as e:
+            connection.close()  # Força uma conexão nova na próxima tentativa
+            if attempt == max_retries:
+                return [(payload, f'transitório: {e}') for payload in payloads]
+            logger.warning(f"Erro transitório ao criar {len(payloads)} perfis (tentativa {attempt + 1}): {e}")
+            time.sleep(backoff(attempt))
+        except Exception:
+            # Erro que não passa com retry (ex: dado inválido): isola a mensagem culpada, grava as outras
+            break
+
+    failed = []
+    for payload in payloads:
+        try:
+            create_profiles([payload])
+        except Exception as e:
+            failed.append((payload, str(e)))
+    return failed
+
+
+def dead_letter(producer, payload, reason):
+    """Publica na DLQ o evento que não pôde ser processado, com o motivo (para reprocessar depois)."""
+    logger.error(f"user_created para a DLQ ({reason}): {payload}")
+    producer.publish(
+        {'event': 'user_created', 'payload': payload, 'reason': reason, 'failed_at': timezone.now().isoformat()},
+        routing_key=settings.USER_CREATED_DLQ,
+        declare=[dead_letter_queue()],
+        serializer='json',
+        delivery_mode=2,
+    )
+
+
+def task_payload(message):
+    """Extrai o payload de uma mensagem de task Celery (protocolo 2: [args, kwargs, embed]; ou 1: {'args': ...})."""
+    body = message.decode()
+    args = body.get('args') if isinstance(body, dict) else body[0]
+    payload = args[0]
+    int(payload['id'])  # Sem id válido a mensagem não tem conserto: vai direto para a DLQ
+    return payload
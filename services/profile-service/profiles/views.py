@@ -1,29 +1,38 @@
-from rest_framework import viewsets, generics, status, filters
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from rest_framework import viewsets, generics, status
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
-from .serializers import TornarSeFreelancerSerializer
-from .authentication import StatelessJWTAuthentication
-
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from drf_spectacular.types import OpenApiTypes
+from shared.auth import StatelessJWTAuthentication
+from shared.uploads import UploadRequestSerializer, presigned_upload
+from . import public_profile, reference
 from .models import Freelancer, PortfolioItem, Idioma, Habilidade
 from .serializers import (
     TornarSeFreelancerSerializer,
     PortfolioItemSerializer,
     FreelancerSerializer,
     IdiomaSerializer,
-    HabilidadeSerializer
+    HabilidadeSerializer,
+    FreelancerProfileSerializer,
+    FreelancerCardSerializer,
+    UPLOAD_KINDS,
+    upload_prefix
 )
 
 
 class TornarSeFreelancerView(APIView):
     """
     Endpoint para criar/atualizar perfil de vendedor.
-    Recebe Multipart Form Data (Arquivo + Dados).
+    Recebe Multipart Form Data (Arquivo + Dados) ou JSON com fotoPerfilKey (upload direto via /uploads/).
     """
     authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]  # Exige token válido
-    parser_classes = (MultiPartParser, FormParser)  # Crucial para receber a imagem
+    parser_classes = (MultiPartParser, FormParser, JSONParser)
 
     def post(self, request, *args, **kwargs):
         # Passa o request no context para pegarmos o user.id dentro do serializer
@@ -36,34 +45,154 @@ class TornarSeFreelancerView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class UploadRequestView(APIView):
+    """
+    Upload direto para o MinIO: devolve um POST assinado e o arquivo não passa pelo Django.
+    Depois a chave é confirmada em fotoPerfilKey (become-freelancer) ou arquivo_key (portfolio).
+    """
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(request=UploadRequestSerializer, responses={201: OpenApiTypes.OBJECT})
+    def post(self, request, kind):
+        if kind not in UPLOAD_KINDS:
+            return Response({"error": "Tipo de upload inválido."}, status=status.HTTP_404_NOT_FOUND)
+
+        serializer = UploadRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = presigned_upload(
+            upload_prefix(kind, request.user.id),
+            allowed_types=UPLOAD_KINDS[kind][1],
+            **serializer.validated_data
+        )
+        return Response(data, status=status.HTTP_201_CREATED)
+
+
 class FreelancerMeView(generics.RetrieveAPIView):
     authentication_classes = [StatelessJWTAuthentication]
     serializer_class = FreelancerSerializer
     permission_classes = [IsAuthenticated]
 
     def get_object(self):
-        # Retorna o perfil do usuário logado
-        return Freelancer.objects.get(id=self.request.user.id)
+        # Retorna o perfil do usuário logado (habilidades e formações na mesma leitura, sem N+1).
+        # Cliente só tem perfil depois do become-freelancer
+        freelancer = Freelancer.objects.prefetch_related('habilidades', 'formacoes').filter(id=self.request.user.id).first()
+        if freelancer is None:
+            raise NotFound("Perfil de freelancer não encontrado.")
+        return freelancer
 
 
-class IdiomaViewSet(viewsets.ReadOnlyModelViewSet):
+class FreelancerProfileView(APIView):
+    """
+    Perfil público agregado (perfil, habilidades, idiomas, formações e portfólio) numa só chamada.
+    Servido pronto do Redis (public_profile), com ETag: as páginas de gig renderizam vários de uma vez.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    @extend_schema(responses={200: FreelancerProfileSerializer})
+    def get(self, request, pk):
+        cached = public_profile.get_profile(pk)
+        if cached is None:
+            raise NotFound('Freelancer não encontrado.')
+
+        body, etag = cached
+        if etag in request.headers.get('If-None-Match', ''):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(body, content_type='application/json')
+
+        response['ETag'] = etag
+        response['Cache-Control'] = 'public, no-cache'
+        return response
+
+
+class FreelancerCardsView(APIView):
+    """
+    Cartões de vários vendedores numa chamada: /api/profiles/freelancers/cards/?ids=1,2,3
+    Usado pelo Catalog Service para embutir o vendedor nas listagens. Devolve na ordem pedida,
+    omitindo ids inexistentes ou inativos.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        parameters=[OpenApiParameter('ids', OpenApiTypes.STR, required=True, description='Ids separados por vírgula')],
+        responses={200: FreelancerCardSerializer(many=True)},
+    )
+    def get(self, request):
+        try:
+            ids = list(dict.fromkeys(int(pk) for pk in request.query_params.get('ids', '').split(',') if pk.strip()))
+        except ValueError:
+            return Response({"error": "ids deve ser uma lista de inteiros separados por vírgula."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > settings.PROFILE_CARDS_MAX_IDS:
+            return Response({"error": f"Máximo de {settings.PROFILE_CARDS_MAX_IDS} ids por chamada."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        cards = public_profile.get_cards(ids) if ids else {}
+        return Response([cards[pk] for pk in ids if pk in cards])
+
+
+class ReferenceDataMixin:
+    """
+    Listas de referência servidas do snapshot versionado em memória (reference.py), sem banco.
+    A lista completa vai pronta, com ETag; ?search= usa o índice de prefixos (autocomplete).
+    """
+    reference_name = None
+    max_search_limit = 100
+
+    @extend_schema(parameters=[
+        OpenApiParameter('search', OpenApiTypes.STR, description='Busca por prefixo, sem acentos'),
+        OpenApiParameter('limit', OpenApiTypes.INT, description='Máximo de resultados da busca (padrão 20, até 100)'),
+    ])
+    def list(self, request, *args, **kwargs):
+        snapshot = reference.snapshot()
+        query = request.query_params.get('search', '').strip()
+        if query:
+            return Response(snapshot.search(self.reference_name, query, self.get_search_limit(request)))
+
+        body, etag = snapshot.payloads[self.reference_name]
+        if etag in request.headers.get('If-None-Match', ''):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(body, content_type='application/json')
+
+        response['ETag'] = etag
+        response['Cache-Control'] = 'public, no-cache'  # Sempre revalida, mas o 304 é barato
+        return response
+
+    def get_search_limit(self, request):
+        try:
+            limit = int(request.query_params.get('limit', settings.REFERENCE_SEARCH_LIMIT))
+        except ValueError:
+            limit = settings.REFERENCE_SEARCH_LIMIT
+        return min(max(limit, 1), self.max_search_limit)
+
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            item = reference.snapshot().by_id[self.reference_name].get(int(kwargs['pk']))
+        except ValueError:
+            item = None
+        if item is None:
+            raise NotFound()
+        return Response(item)
+
+
+class IdiomaViewSet(ReferenceDataMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Idioma.objects.all().order_by('nome')
     serializer_class = IdiomaSerializer
     permission_classes = [AllowAny]
     authentication_classes = []
-
-    filter_backends = [filters.SearchFilter]
-    search_fields = ['nome', 'iso_codigo']
+    reference_name = 'idiomas'
 
 
-class HabilidadeViewSet(viewsets.ReadOnlyModelViewSet):
+class HabilidadeViewSet(ReferenceDataMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Habilidade.objects.all().order_by('nome')
     serializer_class = HabilidadeSerializer
     permission_classes = [AllowAny]
     authentication_classes = []
-
-    filter_backends = [filters.SearchFilter]
-    search_fields = ['nome']
+    reference_name = 'habilidades'
 
 class PortfolioViewSet(viewsets.ModelViewSet):
     authentication_classes = [StatelessJWTAuthentication]
@@ -5,4 +5,11 @@ __all__ = [
     "utils",
     "choices",
     "middlewares",
+    "cache",
+    "images",
+    "uploads",
+    "auth_metrics",
+    "auth",
+    "http",
+    "pagination",
 ]
\ No newline at end of file
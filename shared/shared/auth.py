@@ -0,0 +1,218 @@
+import hmac
+import time
+from functools import lru_cache
+import jwt
+from django.conf import settings
+from rest_framework import HTTP_HEADER_ENCODING
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+from .auth_metrics import debug_sample, metrics
+from .cache import TTLCache
+
+
+class TokenUser:
+    """
+    Usuário em memória montado a partir das claims do JWT (nenhum serviço além do Auth tem a tabela de usuários).
+    Com __slots__: leve para criar a cada requisição e para guardar no cache de tokens.
+    """
+    __slots__ = ('id', 'email', 'nome', 'tipo', 'is_staff')
+
+    is_authenticated = True
+    is_anonymous = False
+    is_active = True
+
+    def __init__(self, id, email='', nome='', tipo='', is_staff=False):
+        self.id = id
+        self.email = email
+        self.nome = nome
+        self.tipo = tipo
+        self.is_staff = is_staff
+
+    @property
+    def pk(self):
+        return self.id
+
+    @property
+    def username(self):
+        return f"user_{self.id}"
+
+    def __eq__(self, other):
+        return isinstance(other, TokenUser) and other.id == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __str__(self):
+        return self.username
+
+
+@lru_cache(maxsize=1)
+def _jwt_config():
+    """
+    Lê SIMPLE_JWT uma vez por processo (mesmos nomes e padrões do simplejwt) e prepara a chave.
+    """
+    conf = getattr(settings, 'SIMPLE_JWT', {})
+    algorithm = conf.get('ALGORITHM', 'HS256')
+    key = conf.get('VERIFYING_KEY') or conf.get('SIGNING_KEY') or settings.SECRET_KEY
+    if algorithm.startswith('HS'):
+        key = key.encode('utf-8') if isinstance(key, str) else key
+    else:
+        key = jwt.get_algorithm_by_name(algorithm).prepare_key(key)
+
+    header_types = conf.get('AUTH_HEADER_TYPES', ('Bearer',))
+    if isinstance(header_types, str):
+        header_types = (header_types,)
+
+    return {
+        'key': key,
+        'algorithms': [algorithm],
+        'audience': conf.get('AUDIENCE'),
+        'issuer': conf.get('ISSUER'),
+        'leeway': conf.get('LEEWAY', 0),
+        'user_id_claim': conf.get('USER_ID_CLAIM', 'user_id'),
+        'token_type_claim': conf.get('TOKEN_TYPE_CLAIM', 'token_type'),
+        'header_types': {t.encode(HTTP_HEADER_ENCODING) for t in header_types},
+    }
+
+
+@lru_cache(maxsize=1)
+def _token_cache():
+    return TTLCache(
+        maxsize=getattr(settings, 'AUTH_TOKEN_CACHE_SIZE', 10000),
+        ttl=getattr(settings, 'AUTH_TOKEN_CACHE_TTL', 60),
+    )
+
+
+def clear_token_cache():
+    _token_cache().clear()
+
+
+class StatelessJWTAuthentication(BaseAuthentication):
+    """
+    Autenticação JWT sem banco, compartilhada pelos serviços.
+
+    1. AUTH_TRUST_GATEWAY_HEADERS=True: confia nos headers X-User-* injetados pelo ForwardAuth do Traefik
+       (o Auth Service já validou o token e o status da conta), mas só quando a requisição traz também
+       X-Gateway-Secret igual a AUTH_GATEWAY_SECRET. O segredo só sai da resposta do Auth Service (o
+       ForwardAuth substitui o header enviado pelo cliente): sem ele, os X-User-* são ignorados.
+    2. Senão, valida o JWT (assinatura, exp, tipo 'access') com a chave do SIMPLE_JWT, preparada uma vez.
+       Tokens decodificados ficam em cache por processo até o 'exp' (no máximo AUTH_TOKEN_CACHE_TTL).
+    """
+    www_authenticate_realm = 'api'
+
+    def authenticate(self, request):
+        if getattr(settings, 'AUTH_TRUST_GATEWAY_HEADERS', False):
+            user = self.authenticate_gateway(request)
+            if user is not None:
+                return user, None
+
+        raw_token = self.get_raw_token(request)
+        if raw_token is None:
+            return None
+
+        started = time.perf_counter()
+        key = raw_token.rsplit(b'.', 1)[-1]
+        cache = _token_cache()
+        cached = cache.get(key)
+        if cached is not None:
+            metrics.record_success(time.perf_counter() - started, cached=True)
+            return cached
+
+        try:
+            payload = self.decode(raw_token)
+            user = self.get_user(payload)
+        except AuthenticationFailed as e:
+            elapsed = time.perf_counter() - started
+            metrics.record_failure(e.reason, elapsed)
+            debug_sample('Token rejeitado', reason=e.reason, latency_ms=round(elapsed * 1000, 3))
+            raise
+
+        elapsed = time.perf_counter() - started
+        metrics.record_success(elapsed)
+        debug_sample('Token validado', user_id=user.id, latency_ms=round(elapsed * 1000, 3))
+
+        result = (user, payload)
+        cache.set(key, result, ttl=payload['exp'] - time.time())
+        return result
+
+    def authenticate_header(self, request):
+        # Faz o DRF responder 401 (e não 403) quando falta o token
+        return f'Bearer realm="{self.www_authenticate_realm}"'
+
+    def authenticate_gateway(self, request):
+        user_id = request.META.get('HTTP_X_USER_ID')
+        if not user_id or not self.from_gateway(request):
+            return None
+        try:
+            user_id = int(user_id)
+        except ValueError:
+            raise _failed('invalid_gateway_header', 'X-User-Id inválido.')
+        return TokenUser(
+            user_id,
+            email=request.META.get('HTTP_X_USER_EMAIL', ''),
+            tipo=request.META.get('HTTP_X_USER_TYPE', ''),
+            is_staff=request.META.get('HTTP_X_USER_STAFF') == '1',
+        )
+
+    def from_gateway(self, request):
+        """A requisição passou pelo ForwardAuth: traz o segredo compartilhado com o gateway."""
+        secret = getattr(settings, 'AUTH_GATEWAY_SECRET', '')
+        received = request.META.get('HTTP_X_GATEWAY_SECRET', '')
+        # Sem segredo configurado nada é confiável (evita confiar em headers forjados por engano)
+        return bool(secret) and hmac.compare_digest(received.encode('utf-8'), secret.encode('utf-8'))
+
+    def get_raw_token(self, request):
+        header = request.META.get('HTTP_AUTHORIZATION')
+        if not header:
+            return None
+        parts = header.encode(HTTP_HEADER_ENCODING).split()
+        if len(parts) != 2 or parts[0] not in _jwt_config()['header_types']:
+            # Outro esquema (ex: Basic): deixa para o próximo autenticador
+            return None
+        return parts[1]
+
+    def decode(self, raw_token):
+        config = _jwt_config()
+        try:
+            payload = jwt.decode(
+                raw_token,
+                config['key'],
+                algorithms=config['algorithms'],
+                audience=config['audience'],
+                issuer=config['issuer'],
+                leeway=config['leeway'],
+                # Token sem exp ou sem tipo é recusado (não vale para sempre nem passa por access)
+                options={'require': ['exp', config['token_type_claim']]},
+            )
+        except jwt.ExpiredSignatureError:
+            raise _failed('expired', 'Token expirado.')
+        except jwt.InvalidSignatureError:
+            raise _failed('bad_signature', 'Token inválido.')
+        except jwt.DecodeError:
+            raise _failed('malformed', 'Token inválido.')
+        except jwt.MissingRequiredClaimError:
+            raise _failed('missing_claim', 'Token inválido.')
+        except jwt.InvalidTokenError:
+            raise _failed('invalid', 'Token inválido.')
+
+        if payload[config['token_type_claim']] != 'access':
+            raise _failed('wrong_token_type', 'Use um token de acesso.')
+        return payload
+
+    def get_user(self, payload):
+        user_id = payload.get(_jwt_config()['user_id_claim'])
+        if not user_id:
+            raise _failed('missing_user_id', 'Token sem user_id válido.')
+        return TokenUser(
+            user_id,
+            email=payload.get('email', ''),
+            nome=payload.get('name', ''),
+            tipo=payload.get('tipo', ''),
+            is_staff=payload.get('is_staff', False),
+        )
+
+
+def _failed(reason, message):
+    error = AuthenticationFailed(message, code='token_not_valid')
+    error.reason = reason  # Motivo para as métricas (shared.auth_metrics)
+    return error
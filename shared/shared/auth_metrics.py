@@ -0,0 +1,88 @@
+import logging
+import random
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from django.conf import settings
+
+logger = logging.getLogger('shared.auth')
+
+# Limites superiores (ms) dos baldes do histograma de latência da validação de token
+LATENCY_BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50)
+
+
+class AuthMetrics:
+    """
+    Instrumentação da autenticação, em memória e por processo: contadores de validações
+    (com acertos de cache), falhas por motivo e histograma de latência.
+    Nada é escrito por requisição: um resumo estruturado vai para o log a cada
+    AUTH_METRICS_LOG_INTERVAL segundos, e snapshot() expõe os números a quem quiser coletar.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._last_log = time.monotonic()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.validations = 0
+            self.cache_hits = 0
+            self.failures = Counter()
+            self.latency_counts = [0] * (len(self.buckets) + 1)  # Último balde: acima do maior limite
+            self.latency_sum_ms = 0.0
+
+    def record_success(self, duration, cached=False):
+        with self._lock:
+            self.validations += 1
+            self.cache_hits += cached
+            self._observe(duration)
+        self._maybe_log()
+
+    def record_failure(self, reason, duration):
+        with self._lock:
+            self.failures[reason] += 1
+            self._observe(duration)
+        self._maybe_log()
+
+    def _observe(self, duration):
+        ms = duration * 1000
+        self.latency_counts[bisect_left(self.buckets, ms)] += 1
+        self.latency_sum_ms += ms
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'validations': self.validations,
+                'cache_hits': self.cache_hits,
+                'failures': dict(self.failures),
+                'latency_ms': {
+                    'buckets': dict(zip([*map(str, self.buckets), '+Inf'], self.latency_counts)),
+                    'sum': round(self.latency_sum_ms, 3),
+                    'count': sum(self.latency_counts),
+                },
+            }
+
+    def _maybe_log(self):
+        interval = getattr(settings, 'AUTH_METRICS_LOG_INTERVAL', 60)
+        now = time.monotonic()
+        if not interval or now - self._last_log < interval:
+            return
+        self._last_log = now
+        logger.info('auth metrics', extra={'auth_metrics': self.snapshot()})
+
+
+def debug_sample(message, **fields):
+    """
+    Log de debug amostrado (AUTH_DEBUG_SAMPLE_RATE, de 0 a 1; padrão 0 = desligado).
+    Só campos estruturados e não sensíveis (user_id, motivo, latência): nunca o token ou as claims.
+    """
+    rate = getattr(settings, 'AUTH_DEBUG_SAMPLE_RATE', 0.0)
+    if rate > 0 and logger.isEnabledFor(logging.DEBUG) and random.random() < rate:
+        logger.debug(message, extra={'auth': fields})
+
+
+# Instância do processo, compartilhada pelos autenticadores
+metrics = AuthMetrics()
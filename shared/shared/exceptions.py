@@ -11,4 +11,8 @@ class ConflictException(APIException):
 
 class UnauthorizedException(APIException):
     status_code = status.HTTP_401_UNAUTHORIZED
-    default_detail = 'Não autorizado'
\ No newline at end of file
+    default_detail = 'Não autorizado'
+
+class ServiceUnavailableException(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Serviço indisponível'
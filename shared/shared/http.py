@@ -0,0 +1,50 @@
+import threading
+import time
+
+
+class CircuitBreaker:
+    """
+    Disjuntor simples (por processo).
+    Depois de `failure_threshold` falhas seguidas ele abre e as chamadas falham na hora,
+    sem tocar na rede. Passados `reset_timeout` segundos, libera uma chamada de teste.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                # Meio-aberto: rearma o relógio para só uma chamada de teste passar por janela
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+def pooled_session(pool_size):
+    """Session do requests com pool de conexões keep-alive (uma por worker, criada após o fork)."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
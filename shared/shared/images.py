@@ -0,0 +1,129 @@
+import io
+import os
+from django.core.files.base import ContentFile
+from rest_framework import serializers
+
+# Larguras (px) das variantes responsivas geradas a partir do original
+DEFAULT_WIDTHS = (320, 640, 1280)
+
+# Formato -> (extensão, opções do Pillow). AVIF só entra se o Pillow instalado suportar.
+FORMATS = {
+    'avif': ('avif', {'quality': 55}),
+    'webp': ('webp', {'quality': 80, 'method': 4}),
+}
+
+
+def available_formats():
+    """Formatos de saída suportados pelo Pillow deste ambiente (AVIF exige Pillow >= 11.2 ou plugin)."""
+    from PIL import Image, features
+
+    Image.init()
+    extensions = Image.registered_extensions()
+    return [
+        fmt for fmt in FORMATS
+        if f'.{FORMATS[fmt][0]}' in extensions and (fmt != 'webp' or features.check('webp'))
+    ]
+
+
+def generate_variants(storage, name, widths=DEFAULT_WIDTHS, formats=None):
+    """
+    Gera as variantes (WebP/AVIF em várias larguras) do arquivo `name` já salvo no storage
+    e salva cada uma ao lado do original. Lê o original em streaming do storage e, para JPEG,
+    já decodifica reduzido (draft), sem carregar a imagem inteira em tamanho real.
+
+    Retorna o dicionário guardado no model:
+        {'source': name, 'width': 3000, 'height': 2000, 'webp': {'320': 'path_320.webp', ...}, ...}
+    """
+    from PIL import Image, ImageOps
+
+    formats = formats or available_formats()
+    largest = max(widths)
+
+    with storage.open(name, 'rb') as original:
+        with Image.open(original) as img:
+            source_size = img.size
+            img.draft('RGB', (largest, largest))
+            img = ImageOps.exif_transpose(img)
+            has_alpha = img.mode in ('RGBA', 'LA', 'PA') or 'transparency' in img.info
+            img = img.convert('RGBA' if has_alpha else 'RGB')
+
+    # Só reduz: larguras maiores que o original viram uma única variante no tamanho original
+    targets = sorted((w for w in widths if w < img.width), reverse=True) or [img.width]
+
+    variants = {'source': name, 'width': source_size[0], 'height': source_size[1]}
+    stem = os.path.splitext(name)[0]
+    resized = {}
+    current = img
+    for width in targets:
+        # Em cascata (da maior para a menor): cada redução parte da anterior, bem mais barato
+        height = max(1, round(current.height * width / current.width))
+        current = current.resize((width, height), Image.LANCZOS, reducing_gap=3.0)
+        resized[width] = current
+
+    for fmt in formats:
+        extension, options = FORMATS[fmt]
+        variants[fmt] = {}
+        for width, image in resized.items():
+            buffer = io.BytesIO()
+            image.save(buffer, format=fmt.upper(), **options)
+            saved = storage.save(f'{stem}_{width}.{extension}', ContentFile(buffer.getvalue()))
+            variants[fmt][str(width)] = saved
+
+    return variants
+
+
+def needs_variants(field_file, variants):
+    """True se o arquivo atual do campo ainda não tem variantes geradas (novo upload ou troca)."""
+    return bool(field_file and field_file.name) and (variants or {}).get('source') != field_file.name
+
+
+def process_image_field(instance, field_name, variants_field, **kwargs):
+    """
+    Gera as variantes do campo de imagem de `instance` e grava em `variants_field` com um UPDATE
+    (sem save(): não dispara signals de novo). Arquivo que não é imagem fica registrado sem variantes.
+    O UPDATE só grava se o campo ainda aponta para o mesmo arquivo: se a imagem foi trocada enquanto
+    as variantes eram geradas, elas são descartadas (o processamento do arquivo novo grava as dele).
+    Retorna o dicionário gravado, ou None se não havia nada a fazer.
+    """
+    from PIL import UnidentifiedImageError
+
+    field_file = getattr(instance, field_name)
+    if not needs_variants(field_file, getattr(instance, variants_field)):
+        return None
+
+    try:
+        variants = generate_variants(field_file.storage, field_file.name, **kwargs)
+    except (UnidentifiedImageError, FileNotFoundError):
+        # Não é imagem (ex: PDF do portfólio) ou a chave não existe no bucket: não adianta tentar de novo
+        variants = {'source': field_file.name}
+
+    updated = type(instance).objects.filter(pk=instance.pk, **{field_name: field_file.name}).update(
+        **{variants_field: variants}
+    )
+    if not updated:
+        for fmt in FORMATS:
+            for path in variants.get(fmt, {}).values():
+                field_file.storage.delete(path)
+        return None
+    setattr(instance, variants_field, variants)
+    return variants
+
+
+def variant_urls(variants, storage):
+    """Converte os caminhos das variantes em URLs: {'webp': {'320': url, ...}, 'avif': {...}}."""
+    return {
+        fmt: {width: storage.url(path) for width, path in (variants or {}).get(fmt, {}).items()}
+        for fmt in FORMATS if fmt in (variants or {})
+    }
+
+
+class ImageVariantsField(serializers.ReadOnlyField):
+    """Campo DRF (somente leitura) com as variantes como URLs, usando o storage do campo de imagem."""
+
+    def __init__(self, image_field, **kwargs):
+        self.image_field = image_field
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        storage = self.parent.Meta.model._meta.get_field(self.image_field).storage
+        return variant_urls(value, storage)
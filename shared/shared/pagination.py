@@ -0,0 +1,121 @@
+import base64
+import json
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Base da paginação por cursor (keyset) dos serviços. Cada página é um
+    "WHERE (ordem) > cursor ... LIMIT n": custo constante na página 1 ou na 200, sem OFFSET nem COUNT(*).
+
+    O cursor é a posição do último item da página (valores das colunas de `ordering`, a PK por último)
+    em JSON/base64. Ao decodificar, cada valor passa pelo to_python do campo (ou da anotação):
+    cursor adulterado vira 404, nunca um erro do banco.
+    Subclasses definem a ordenação e montam a página (set_page).
+    """
+    page_size = 20
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    ordering = ('-pk',)
+    invalid_cursor_message = 'Cursor inválido.'
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def set_page(self, results):
+        """Recebe até page_size + 1 itens: o excedente só indica que existe próxima página."""
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        return self.page
+
+    def after(self, position):
+        """
+        Tudo que vem depois do cursor: (a > x) OR (a = x AND b > y) OR ..., cada coluna
+        na sua direção. Com um índice composto na mesma ordem vira um range scan.
+        """
+        condition = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def filter_after(self, queryset, position):
+        try:
+            return queryset.filter(self.after(position))
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        position = [getattr(last, field.lstrip('-')) for field in self.ordering]
+        raw = json.dumps(position, default=str)
+        cursor = base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request, queryset):
+        """Posição do cursor com os valores já convertidos para o tipo de cada coluna (None sem cursor)."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        values = []
+        for field, value in zip(self.ordering, position):
+            model_field = self._ordering_field(queryset, field.lstrip('-'))
+            if value is None or model_field is None:
+                values.append(value)
+                continue
+            try:
+                values.append(model_field.to_python(value))
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+        return values
+
+    @staticmethod
+    def _ordering_field(queryset, name):
+        """Campo (do model ou da anotação) de uma coluna da ordenação; None se não der para resolver."""
+        if name == 'pk':
+            return queryset.model._meta.pk
+        annotation = queryset.query.annotations.get(name)
+        if annotation is not None:
+            return annotation.output_field
+        try:
+            return queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
@@ -0,0 +1,93 @@
+import os
+import uuid
+from functools import lru_cache
+from django.conf import settings
+from django.core.files.storage import default_storage
+from rest_framework import serializers
+from .constants import MAX_UPLOAD_SIZE_MB
+from .exceptions import ServiceUnavailableException
+
+# Validade do formulário assinado (segundos)
+DEFAULT_EXPIRES = 300
+
+IMAGE_TYPES = ('image/',)
+
+
+@lru_cache(maxsize=1)
+def _public_client():
+    """
+    Cliente S3 só para assinar (não faz chamadas de rede). Usa o endpoint público do MinIO,
+    o mesmo que o navegador enxerga; o storage do Django fala com o endpoint interno.
+    """
+    import boto3
+    from botocore.config import Config
+
+    return boto3.client(
+        's3',
+        endpoint_url=getattr(settings, 'AWS_S3_PUBLIC_ENDPOINT_URL', settings.AWS_S3_ENDPOINT_URL),
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        region_name=settings.AWS_S3_REGION_NAME,
+        config=Config(signature_version='s3v4', s3={'addressing_style': 'path'}),
+    )
+
+
+def direct_uploads_enabled():
+    # Só com o storage S3/MinIO; no fallback local (FileSystemStorage) o upload continua multipart
+    return getattr(default_storage, 'bucket_name', None) is not None
+
+
+def presigned_upload(prefix, filename, content_type, allowed_types=IMAGE_TYPES, max_bytes=None):
+    """
+    Gera um POST assinado para o navegador enviar o arquivo direto ao bucket, sem passar pelo Django.
+    A política assinada restringe a chave, o Content-Type e o tamanho máximo.
+
+    Retorna {'url', 'fields', 'key', 'expires_in'}: o cliente faz um POST multipart para 'url'
+    com todos os 'fields' + o campo 'file', e depois confirma 'key' no endpoint do recurso.
+    """
+    if not direct_uploads_enabled():
+        raise ServiceUnavailableException('Upload direto disponível apenas com o storage S3/MinIO.')
+    if not any(content_type.startswith(allowed) for allowed in allowed_types):
+        raise serializers.ValidationError({'content_type': 'Tipo de arquivo não permitido.'})
+
+    max_bytes = max_bytes or getattr(settings, 'DIRECT_UPLOAD_MAX_BYTES', MAX_UPLOAD_SIZE_MB * 1024 * 1024)
+    expires_in = getattr(settings, 'DIRECT_UPLOAD_EXPIRES', DEFAULT_EXPIRES)
+    extension = os.path.splitext(filename)[1][:10].lower()
+    key = f"{prefix}/{uuid.uuid4().hex}{extension}"  # Nome do arquivo, como fica no FileField
+    location = default_storage.location  # AWS_LOCATION: prefixo do storage dentro do bucket
+
+    presigned = _public_client().generate_presigned_post(
+        Bucket=default_storage.bucket_name,
+        Key=f'{location}/{key}' if location else key,
+        Fields={'Content-Type': content_type},
+        Conditions=[
+            {'Content-Type': content_type},
+            ['content-length-range', 1, max_bytes],
+        ],
+        ExpiresIn=expires_in,
+    )
+    return {
+        'url': presigned['url'],
+        'fields': presigned['fields'],
+        'key': key,
+        'expires_in': expires_in,
+    }
+
+
+def validate_uploaded_key(key, prefix, check_exists=True):
+    """
+    Confirmação do upload direto: a chave tem que ser do prefixo do usuário (ninguém anexa
+    arquivo alheio) e o objeto tem que existir no bucket. Retorna a chave para gravar no FileField.
+    check_exists=False pula o HEAD no bucket (importações em lote).
+    """
+    if not key.startswith(f'{prefix}/') or '..' in key:
+        raise serializers.ValidationError('Arquivo inválido para este usuário.')
+    if check_exists and not default_storage.exists(key):
+        raise serializers.ValidationError('Arquivo não encontrado. Envie o arquivo antes de confirmar.')
+    return key
+
+
+class UploadRequestSerializer(serializers.Serializer):
+    """Pedido de URL assinada: nome original (só para a extensão) e Content-Type do arquivo."""
+    filename = serializers.CharField(max_length=255)
+    content_type = serializers.CharField(max_length=100)